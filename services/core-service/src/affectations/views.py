@@ -1,6 +1,4 @@
 """Views for affectations app."""
-import jwt
-from django.conf import settings
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -13,7 +11,9 @@ from .serializers import (
 )
 from applications.models import Application
 from offers.models import Offer
-from utils.event_publisher import get_event_publisher
+from utils import event_worker
+from utils.event_publisher import EventPublisher
+from utils.jwt_utils import get_user_id_from_token
 
 
 def get_user_id_from_request(request):
@@ -22,25 +22,11 @@ def get_user_id_from_request(request):
     if not auth_header:
         return None
     
-    try:
-        parts = auth_header.split()
-        if len(parts) != 2 or parts[0].lower() != 'bearer':
-            return None
-        
-        token = parts[1]
-        secret_key = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
-        algorithm = getattr(settings, 'JWT_ALGORITHM', 'HS256')
-        
-        payload = jwt.decode(
-            token,
-            secret_key,
-            algorithms=[algorithm],
-            options={"verify_signature": True}
-        )
-        
-        return payload.get('user_id') or payload.get('sub') or payload.get('id')
-    except (jwt.InvalidTokenError, jwt.ExpiredSignatureError, KeyError):
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0].lower() != 'bearer':
         return None
+    
+    return get_user_id_from_token(parts[1])
 
 
 class AffectationPagination(PageNumberPagination):
@@ -118,8 +104,7 @@ class AffectationViewSet(viewsets.ModelViewSet):
         )
         
         # Publish affectation.created event
-        publisher = get_event_publisher()
-        publisher.publish_affectation_created({
+        event_worker.enqueue(EventPublisher.AFFECTATION_CREATED, {
             'affectation_id': str(affectation.id),
             'student_id': str(affectation.student_id),
             'offer_id': str(offer.id),
@@ -146,10 +131,9 @@ class AffectationViewSet(viewsets.ModelViewSet):
             affectation.save()
         
         # Publish affectation.updated event
-        publisher = get_event_publisher()
-        publisher.publish_event(
-            routing_key='core.affectation.updated',
-            payload={
+        event_worker.enqueue(
+            EventPublisher.AFFECTATION_UPDATED,
+            {
                 'affectation_id': str(affectation.id),
                 'student_id': str(affectation.student_id),
                 'offer_id': str(affectation.offer.id)
@@ -172,10 +156,9 @@ class AffectationViewSet(viewsets.ModelViewSet):
             affectation.save()
         
         # Publish affectation.updated event
-        publisher = get_event_publisher()
-        publisher.publish_event(
-            routing_key='core.affectation.updated',
-            payload={
+        event_worker.enqueue(
+            EventPublisher.AFFECTATION_UPDATED,
+            {
                 'affectation_id': str(affectation.id),
                 'student_id': str(affectation.student_id),
                 'offer_id': str(affectation.offer.id)
@@ -195,8 +178,11 @@ class AffectationViewSet(viewsets.ModelViewSet):
         offer_id = str(affectation.offer.id)
         
         # Publish affectation.deleted event before deletion
-        publisher = get_event_publisher()
-        publisher.publish_affectation_deleted(affectation_id, student_id, offer_id)
+        event_worker.enqueue(EventPublisher.AFFECTATION_DELETED, {
+            'affectation_id': affectation_id,
+            'student_id': student_id,
+            'offer_id': offer_id
+        })
         
         affectation.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -37,6 +37,7 @@ class Application(models.Model):
             models.Index(fields=['offer', 'student_id']),
             models.Index(fields=['student_id']),
             models.Index(fields=['status']),
+            models.Index(fields=['-submitted_at', '-id'], name='app_submitted_id_desc'),
         ]
     
     def __str__(self):
@@ -5,51 +5,11 @@ from .models import Application
 from utils.service_client import get_auth_client, get_profile_client
 
 
-class CreateApplicationRequest(serializers.Serializer):
-    """Serializer for creating a new application."""
-    
-    offer_id = serializers.UUIDField(required=True)
-    # student_id is extracted from JWT token, not from request
-    motivation = serializers.CharField(required=False, allow_blank=True)
-    document_ids = serializers.ListField(
-        child=serializers.UUIDField(),
-        required=False,
-        allow_empty=True
-    )
-    
-    def validate_offer_id(self, value):
-        """Validate that offer exists."""
-        from offers.models import Offer
-        if not Offer.objects.filter(id=value).exists():
-            raise serializers.ValidationError('Offer does not exist.')
-        return value
-
-
-class UpdateApplicationRequest(serializers.Serializer):
-    """Serializer for updating an application (student only)."""
-    
-    motivation = serializers.CharField(required=False, allow_blank=True)
-    document_ids = serializers.ListField(
-        child=serializers.UUIDField(),
-        required=False,
-        allow_empty=True
-    )
-
-
-class UpdateApplicationStatusRequest(serializers.Serializer):
-    """Serializer for updating application status (admin/encadrant)."""
-    
-    status = serializers.ChoiceField(
-        choices=['accepted', 'rejected', 'cancelled'],
-        required=True
-    )
-    notes = serializers.CharField(required=False, allow_blank=True)
-
-
 class ApplicationSerializer(serializers.ModelSerializer):
     """Serializer for Application model."""
     
-    offer_id = serializers.UUIDField(source='offer.id', read_only=True)
+    # Read the FK column directly; source='offer.id' loaded the offer per row
+    offer_id = serializers.UUIDField(read_only=True)
     
     class Meta:
         model = Application
@@ -88,10 +48,65 @@ class ApplicationSerializer(serializers.ModelSerializer):
         return data
 
 
+class CreateApplicationRequest(serializers.Serializer):
+    """Serializer for creating a new application."""
+    
+    offer_id = serializers.UUIDField(required=True)
+    # student_id is extracted from JWT token, not from request
+    motivation = serializers.CharField(required=False, allow_blank=True)
+    document_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=True
+    )
+    
+    def validate_offer_id(self, value):
+        """Validate that offer exists."""
+        from offers.models import Offer
+        if not Offer.objects.filter(id=value).exists():
+            raise serializers.ValidationError('Offer does not exist.')
+        return value
+
+
+class UpdateApplicationRequest(ApplicationSerializer):
+    """Serializer for updating an application (student only)."""
+    
+    motivation = serializers.CharField(required=False, allow_blank=True, write_only=True)
+    document_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=True,
+        write_only=True
+    )
+    
+    class Meta(ApplicationSerializer.Meta):
+        fields = ApplicationSerializer.Meta.fields + ['motivation', 'document_ids']
+        read_only_fields = [
+            'id', 'student_id', 'submitted_at', 'status',
+            'decision_at', 'decision_by', 'notes', 'metadata'
+        ]
+
+
+class UpdateApplicationStatusRequest(ApplicationSerializer):
+    """Serializer for updating application status (admin/encadrant)."""
+    
+    status = serializers.ChoiceField(
+        choices=['accepted', 'rejected', 'cancelled'],
+        required=True
+    )
+    notes = serializers.CharField(required=False, allow_blank=True)
+    
+    class Meta(ApplicationSerializer.Meta):
+        read_only_fields = [
+            'id', 'student_id', 'submitted_at',
+            'decision_at', 'decision_by', 'metadata'
+        ]
+
+
 class ApplicationWithDetails(serializers.ModelSerializer):
     """Detailed serializer for single application retrieval with nested data."""
     
-    offer_id = serializers.UUIDField(source='offer.id', read_only=True)
+    offer_id = serializers.UUIDField(read_only=True)
     offer = serializers.SerializerMethodField()
     student = serializers.SerializerMethodField()
     decision_by_encadrant = serializers.SerializerMethodField()
@@ -164,8 +179,9 @@ class ApplicationWithDetails(serializers.ModelSerializer):
 
 
 class PaginatedApplications(serializers.Serializer):
-    """Paginated response for applications list."""
+    """Cursor-paginated response for applications list."""
     
+    # Approximate: table statistics or a short-lived cached COUNT(*)
     count = serializers.IntegerField()
     next = serializers.URLField(allow_null=True)
     previous = serializers.URLField(allow_null=True)
@@ -142,3 +142,16 @@ class ApplicationModelTest(TestCase):
         applications = list(Application.objects.all())
         self.assertEqual(applications[0].id, app2.id)
         self.assertEqual(applications[1].id, app1.id)
+    
+    def test_offer_has_available_slots(self):
+        """Test that accepted applications consume offer slots."""
+        self.assertTrue(self.offer.has_available_slots())
+        
+        for _ in range(self.offer.available_slots):
+            Application.objects.create(
+                offer=self.offer,
+                student_id=uuid.uuid4(),
+                status=Application.STATUS_ACCEPTED
+            )
+        
+        self.assertFalse(self.offer.has_available_slots())
@@ -1,11 +1,12 @@
 """Views for applications app."""
-import jwt
-from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import Http404
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
 from django_filters import rest_framework as filters
 from .models import Application
 from .serializers import (
@@ -14,43 +15,55 @@ from .serializers import (
     UpdateApplicationStatusRequest
 )
 from offers.models import Offer
-from utils.event_publisher import get_event_publisher
+from utils import event_worker
+from utils.event_publisher import EventPublisher
+from utils.jwt_utils import get_user_id_from_token
+from utils.pagination import approximate_count
 from utils.rbac import get_user_role, get_user_id
 
 
+# Status sentinels bound as module globals for the hot paths below
+_SUBMITTED = Application.STATUS_SUBMITTED
+_ACCEPTED = Application.STATUS_ACCEPTED
+_REJECTED = Application.STATUS_REJECTED
+_CANCELLED = Application.STATUS_CANCELLED
+_DECIDED = frozenset((_ACCEPTED, _REJECTED))
+
+
 def get_user_id_from_request(request):
     """Extract user_id from JWT token in Authorization header."""
     auth_header = request.META.get('HTTP_AUTHORIZATION', '')
     if not auth_header:
         return None
     
-    try:
-        parts = auth_header.split()
-        if len(parts) != 2 or parts[0].lower() != 'bearer':
-            return None
-        
-        token = parts[1]
-        secret_key = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
-        algorithm = getattr(settings, 'JWT_ALGORITHM', 'HS256')
-        
-        payload = jwt.decode(
-            token,
-            secret_key,
-            algorithms=[algorithm],
-            options={"verify_signature": True}
-        )
-        
-        return payload.get('user_id') or payload.get('sub') or payload.get('id')
-    except (jwt.InvalidTokenError, jwt.ExpiredSignatureError, KeyError):
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0].lower() != 'bearer':
         return None
+    
+    return get_user_id_from_token(parts[1])
 
 
-class ApplicationPagination(PageNumberPagination):
-    """Custom pagination for applications."""
+class ApplicationPagination(CursorPagination):
+    """Keyset pagination for applications (constant cost at any depth)."""
     page_size = 20
     page_size_query_param = 'per_page'
     max_page_size = 100
-    page_query_param = 'page'
+    # id breaks ties between applications submitted in the same instant
+    ordering = ('-submitted_at', '-id')
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate and remember an approximate total for the response."""
+        self.count = approximate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        """Include the approximate count alongside the cursors."""
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
 
 
 class ApplicationFilter(filters.FilterSet):
@@ -90,6 +103,9 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             print(f"[DEBUG] Not filtering - showing all applications (role={role})")
         
         # Admins and encadrants see all applications (no filter)
+        if self.action == 'retrieve':
+            # ApplicationWithDetails renders nested offer fields
+            queryset = queryset.select_related('offer')
         return queryset
     
     def get_serializer_class(self):
@@ -116,25 +132,26 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        # Verify offer exists and is active
-        try:
-            offer = Offer.objects.get(id=serializer.validated_data['offer_id'])
-            if offer.status != Offer.STATUS_PUBLISHED:
-                return Response(
-                    {'error': 'This offer is not currently accepting applications'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except Offer.DoesNotExist:
+        # Verify offer exists and is active (only the columns used below)
+        offer = Offer.objects.only('id', 'status', 'title').filter(
+            pk=serializer.validated_data['offer_id']
+        ).first()
+        if offer is None:
             return Response(
                 {'error': 'Offer not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+        if offer.status != Offer.STATUS_PUBLISHED:
+            return Response(
+                {'error': 'This offer is not currently accepting applications'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Create application - use user_id from token as student_id
         application = Application.objects.create(
             student_id=user_id,  # Use JWT user_id instead of request data
             offer=offer,
-            status=Application.STATUS_SUBMITTED,
+            status=_SUBMITTED,
             metadata={
                 'motivation': serializer.validated_data.get('motivation'),
                 'document_ids': serializer.validated_data.get('document_ids', [])
@@ -142,8 +159,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         )
         
         # Publish application.submitted event
-        publisher = get_event_publisher()
-        publisher.publish_application_submitted({
+        event_worker.enqueue(EventPublisher.APPLICATION_SUBMITTED, {
             'application_id': str(application.id),
             'student_id': str(application.student_id),
             'offer_id': str(offer.id),
@@ -175,7 +191,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             )
         
         # Can't update if already decided
-        if instance.status in [Application.STATUS_ACCEPTED, Application.STATUS_REJECTED]:
+        if instance.status in _DECIDED:
             return Response(
                 {'error': 'Cannot update application that has been decided'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -196,8 +212,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         instance.save()
         
         # Publish application.updated event
-        publisher = get_event_publisher()
-        publisher.publish_application_updated({
+        event_worker.enqueue(EventPublisher.APPLICATION_UPDATED, {
             'application_id': str(instance.id),
             'student_id': str(instance.student_id),
             'offer_id': str(instance.offer.id),
@@ -206,42 +221,54 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             'updated_at': timezone.now().isoformat()
         })
         
-        response_serializer = ApplicationSerializer(instance)
-        return Response(response_serializer.data)
+        return Response(serializer.data)
     
     def destroy(self, request, *args, **kwargs):
         """Cancel application (student only)."""
-        application = self.get_object()
         user_id = get_user_id_from_request(request)
         
-        # Check if student owns this application
-        if str(application.student_id) != str(user_id):
-            return Response(
-                {'error': 'You can only cancel your own applications'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        # Can't cancel if accepted
-        if application.status == Application.STATUS_ACCEPTED:
+        # Ownership and status guards are part of the UPDATE itself, so the
+        # happy path is a single round trip with no full-row save
+        try:
+            cancelled = Application.objects.filter(
+                pk=kwargs.get('pk'),
+                student_id=user_id
+            ).exclude(
+                status=_ACCEPTED
+            ).update(status=_CANCELLED)
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        
+        if not cancelled:
+            # Re-fetch only to classify the failure
+            application = self.get_object()
+            
+            # Check if student owns this application
+            if str(application.student_id) != str(user_id):
+                return Response(
+                    {'error': 'You can only cancel your own applications'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            
+            # Can't cancel if accepted
             return Response(
                 {'error': 'Cannot cancel an accepted application'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Publish application.withdrawn event before status change
-        publisher = get_event_publisher()
-        publisher.publish_application_withdrawn({
-            'application_id': str(application.id),
-            'student_id': str(application.student_id),
-            'offer_id': str(application.offer.id),
-            'offer_title': application.offer.title,
+        application = Application.objects.filter(pk=kwargs.get('pk')).values(
+            'id', 'student_id', 'offer_id', 'offer__title'
+        ).first()
+        
+        # Publish application.withdrawn event
+        event_worker.enqueue(EventPublisher.APPLICATION_WITHDRAWN, {
+            'application_id': str(application['id']),
+            'student_id': str(application['student_id']),
+            'offer_id': str(application['offer_id']),
+            'offer_title': application['offer__title'],
             'withdrawn_at': timezone.now().isoformat()
         })
         
-        # Set status to cancelled instead of deleting
-        application.status = Application.STATUS_CANCELLED
-        application.save()
-        
         return Response(
             {'message': 'Application cancelled successfully'},
             status=status.HTTP_200_OK
@@ -264,41 +291,53 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         application = self.get_object()
         user_id = get_user_id(request)
         
-        serializer = UpdateApplicationStatusRequest(data=request.data)
+        serializer = UpdateApplicationStatusRequest(application, data=request.data)
         serializer.is_valid(raise_exception=True)
         
         new_status = serializer.validated_data['status']
         
         # Validate status transition
-        if application.status == Application.STATUS_ACCEPTED:
+        if application.status == _ACCEPTED:
             return Response(
                 {'error': 'Cannot change status of an already accepted application'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check available slots if accepting
-        if new_status == 'accepted':
-            if not application.offer.has_available_slots():
-                return Response(
-                    {'error': 'No available slots for this offer'},
-                    status=status.HTTP_400_BAD_REQUEST
+        with transaction.atomic():
+            # Check available slots if accepting. Lock the offer row so two
+            # concurrent accepts cannot both pass the check and oversubscribe.
+            if new_status == _ACCEPTED:
+                offer = Offer.objects.select_for_update().get(pk=application.offer_id)
+                if not offer.has_available_slots():
+                    return Response(
+                        {'error': 'No available slots for this offer'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+            
+            # Update application
+            application.status = new_status
+            application.decision_at = timezone.now()
+            application.decision_by = user_id
+            
+            if 'notes' in serializer.validated_data:
+                application.notes = serializer.validated_data['notes']
+            
+            application.save()
+            
+            # Create affectation if accepted
+            if application.status == _ACCEPTED:
+                from affectations.models import Affectation
+                Affectation.objects.get_or_create(
+                    application=application,
+                    defaults={
+                        'student_id': application.student_id,
+                        'offer': application.offer
+                    }
                 )
         
-        # Update application
-        application.status = new_status
-        application.decision_at = timezone.now()
-        application.decision_by = user_id
-        
-        if 'notes' in serializer.validated_data:
-            application.notes = serializer.validated_data['notes']
-        
-        application.save()
-        
         # Publish event based on status
-        publisher = get_event_publisher()
-        
-        if application.status == Application.STATUS_ACCEPTED:
-            publisher.publish_application_accepted({
+        if application.status == _ACCEPTED:
+            event_worker.enqueue(EventPublisher.APPLICATION_ACCEPTED, {
                 'application_id': str(application.id),
                 'student_id': str(application.student_id),
                 'offer_id': str(application.offer.id),
@@ -306,8 +345,8 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 'decision_by': str(user_id) if user_id else None,
                 'decision_at': application.decision_at.isoformat() if application.decision_at else None
             })
-        elif application.status == Application.STATUS_REJECTED:
-            publisher.publish_application_rejected({
+        elif application.status == _REJECTED:
+            event_worker.enqueue(EventPublisher.APPLICATION_REJECTED, {
                 'application_id': str(application.id),
                 'student_id': str(application.student_id),
                 'offer_id': str(application.offer.id),
@@ -315,16 +354,4 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 'notes': application.notes
             })
         
-        # Create affectation if accepted
-        if application.status == Application.STATUS_ACCEPTED:
-            from affectations.models import Affectation
-            Affectation.objects.get_or_create(
-                application=application,
-                defaults={
-                    'student_id': application.student_id,
-                    'offer': application.offer
-                }
-            )
-        
-        response_serializer = ApplicationSerializer(application)
-        return Response(response_serializer.data)
+        return Response(serializer.data)
@@ -47,6 +47,11 @@ def get_jwt_config():
     }
 
 
+# Decode arguments resolved once at import instead of on every request
+_JWT_CONFIG = get_jwt_config()
+_JWT_ALGS = [_JWT_CONFIG['algorithm']]
+
+
 def decode_access_token(token: str) -> dict:
     """
     Decode and validate JWT access token.
@@ -61,14 +66,12 @@ def decode_access_token(token: str) -> dict:
         TokenExpiredError: If token expired
         InvalidTokenError: If token invalid
     """
-    config = get_jwt_config()
-    
     try:
         payload = jwt.decode(
             token,
-            config['secret_key'],
-            algorithms=[config['algorithm']],
-            issuer=config['issuer']
+            _JWT_CONFIG['secret_key'],
+            algorithms=_JWT_ALGS,
+            issuer=_JWT_CONFIG['issuer']
         )
         
         if payload.get('type') != 'access':
@@ -0,0 +1,20 @@
+"""Logging handlers for core_service."""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedStreamHandler(QueueHandler):
+    """
+    Console handler that writes from a background thread.
+
+    Request threads only enqueue the formatted record; a QueueListener
+    drains the queue to stderr so slow stdout/stderr never blocks a view.
+    """
+
+    def __init__(self):
+        super().__init__(queue.SimpleQueue())
+        self.listener = QueueListener(self.queue, logging.StreamHandler())
+        self.listener.start()
+        atexit.register(self.listener.stop)
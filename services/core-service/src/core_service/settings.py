@@ -92,7 +92,8 @@ LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {'verbose': {'format': '{levelname} {asctime} {module} {message}', 'style': '{'}},
-    'handlers': {'console': {'class': 'logging.StreamHandler', 'formatter': 'verbose'}},
+    # Records are formatted here and written to stderr by a background listener
+    'handlers': {'console': {'class': 'core_service.log_handlers.QueuedStreamHandler', 'formatter': 'verbose'}},
     'root': {'handlers': ['console'], 'level': 'INFO'},
 }
 
@@ -1,5 +1,7 @@
 """Initial migration for offers app - sets up PostgreSQL schema."""
-from django.db import migrations
+import uuid
+
+from django.db import migrations, models
 
 
 def create_schema_and_enums(apps, schema_editor):
@@ -31,4 +33,30 @@ class Migration(migrations.Migration):
     
     operations = [
         migrations.RunPython(create_schema_and_enums, reverse_code=migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='Offer',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('service_id', models.UUIDField()),
+                ('establishment_id', models.UUIDField(blank=True, null=True)),
+                ('created_by', models.UUIDField(blank=True, null=True)),
+                ('period_start', models.DateField(blank=True, null=True)),
+                ('period_end', models.DateField(blank=True, null=True)),
+                ('available_slots', models.IntegerField(default=1)),
+                ('status', models.CharField(
+                    choices=[('draft', 'Draft'), ('published', 'Published'), ('closed', 'Closed')],
+                    default='draft',
+                    max_length=20
+                )),
+                ('metadata', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'core"."offers',
+                'ordering': ['-created_at'],
+            },
+        ),
     ]
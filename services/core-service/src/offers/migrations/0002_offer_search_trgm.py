@@ -0,0 +1,24 @@
+"""Trigram indexes backing the offer title/description search."""
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Add trigram search indexes on offers (ILIKE '%term%' can use them)."""
+
+    dependencies = [
+        ('offers', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='offer',
+            index=GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='offer_title_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=GinIndex(fields=['description'], opclasses=['gin_trgm_ops'], name='offer_desc_trgm'),
+        ),
+    ]
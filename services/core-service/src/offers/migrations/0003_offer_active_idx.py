@@ -0,0 +1,22 @@
+"""Partial index for the active-offers filter."""
+from django.db import migrations, models
+from django.db.models import Q
+
+
+class Migration(migrations.Migration):
+    """Index published offers by period_end (OfferFilter.filter_active_only)."""
+
+    dependencies = [
+        ('offers', '0002_offer_search_trgm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(
+                fields=['status', 'period_end'],
+                condition=Q(status='published'),
+                name='offer_active_idx'
+            ),
+        ),
+    ]
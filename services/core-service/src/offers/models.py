@@ -1,5 +1,6 @@
 """Models for offers app."""
 import uuid
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.core.exceptions import ValidationError
 
@@ -34,6 +35,17 @@ class Offer(models.Model):
     class Meta:
         db_table = 'core"."offers'
         ordering = ['-created_at']
+        indexes = [
+            # Trigram indexes for OfferFilter.filter_search (ILIKE '%term%')
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='offer_title_trgm'),
+            GinIndex(fields=['description'], opclasses=['gin_trgm_ops'], name='offer_desc_trgm'),
+            # Partial index for OfferFilter.filter_active_only (published, not ended)
+            models.Index(
+                fields=['status', 'period_end'],
+                condition=models.Q(status='published'),
+                name='offer_active_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.status})"
@@ -55,4 +67,13 @@ class Offer(models.Model):
     
     def has_available_slots(self):
         """Check if offer has available slots."""
-        return self.get_accepted_count() < self.available_slots
+        from applications.models import Application
+        if self.available_slots <= 0:
+            return False
+        # Only need to know whether the count reaches available_slots,
+        # so bound the scan instead of counting every accepted application
+        accepted = Application.objects.filter(
+            offer=self,
+            status=Application.STATUS_ACCEPTED
+        )[:self.available_slots].count()
+        return accepted < self.available_slots
@@ -1,8 +1,11 @@
 """Serializers for offers app."""
+import logging
 from rest_framework import serializers
 from .models import Offer
 from utils.service_client import get_auth_client, get_profile_client
 
+logger = logging.getLogger(__name__)
+
 
 class CreateOfferRequest(serializers.ModelSerializer):
     """Serializer for creating a new offer."""
@@ -129,7 +132,8 @@ class OfferSerializer(serializers.ModelSerializer):
 class OfferListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing offers."""
     
-    accepted_count = serializers.SerializerMethodField()
+    # Annotated by OfferViewSet.get_queryset for the list action
+    accepted_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Offer
@@ -137,10 +141,6 @@ class OfferListSerializer(serializers.ModelSerializer):
             'id', 'title', 'service_id', 'period_start', 'period_end',
             'available_slots', 'accepted_count', 'status', 'created_at'
         ]
-    
-    def get_accepted_count(self, obj):
-        """Get count of accepted applications."""
-        return obj.get_accepted_count()
 
 
 class OfferWithDetails(serializers.ModelSerializer):
@@ -195,8 +195,12 @@ class OfferWithDetails(serializers.ModelSerializer):
                 'name': service_data.get('name'),
                 'establishment': establishment
             }
-        except Exception as e:
-            print(f"Error fetching service details: {e}")
+        except Exception:
+            logger.warning(
+                "service fetch failed",
+                exc_info=True,
+                extra={'service_id': str(obj.service_id)}
+            )
             return {
                 'id': str(obj.service_id),
                 'name': None,
@@ -222,17 +226,24 @@ class OfferWithDetails(serializers.ModelSerializer):
 'last_name': encadrant_data.get('last_name'),
                 'specialty': encadrant_data.get('specialty'),
             }
-        except Exception as e:
-            print(f"Error fetching encadrant details: {e}")
+        except Exception:
+            logger.warning(
+                "encadrant fetch failed",
+                exc_info=True,
+                extra={'created_by': str(obj.created_by)}
+            )
             return None
     
     def get_application_count(self, obj):
         """Get total count of applications."""
-        return obj.applications.count()
+        count = getattr(obj, 'application_count', None)
+        return count if count is not None else obj.applications.count()
     
     def get_remaining_slots(self, obj):
         """Calculate remaining available slots."""
-        accepted_count = obj.get_accepted_count()
+        accepted_count = getattr(obj, 'accepted_count', None)
+        if accepted_count is None:
+            accepted_count = obj.get_accepted_count()
         return max(0, obj.available_slots - accepted_count)
 
 
@@ -12,13 +12,17 @@ from offers.models import Offer
 class OfferModelTest(TestCase):
     """Test cases for Offer model."""
     
+    @classmethod
+    def setUpTestData(cls):
+        """Shared ids, created once for the whole class."""
+        cls.service_id = uuid.uuid4()
+    
     def test_offer_creation(self):
         """Test creating a basic offer."""
-        service_id = uuid.uuid4()
         offer = Offer.objects.create(
             title="Cardiology Internship",
             description="6-month internship in cardiology department",
-            service_id=service_id,
+            service_id=self.service_id,
             period_start=date.today(),
             period_end=date.today() + timedelta(days=180),
             available_slots=5,
@@ -26,7 +30,7 @@ class OfferModelTest(TestCase):
         )
         
         self.assertEqual(offer.title, "Cardiology Internship")
-        self.assertEqual(offer.service_id, service_id)
+        self.assertEqual(offer.service_id, self.service_id)
         self.assertEqual(offer.available_slots, 5)
         self.assertEqual(offer.status, Offer.STATUS_PUBLISHED)
         self.assertIsInstance(offer.id, uuid.UUID)
@@ -35,7 +39,7 @@ class OfferModelTest(TestCase):
         """Test that default status is 'draft'."""
         offer = Offer.objects.create(
             title="Test Offer",
-            service_id=uuid.uuid4()
+            service_id=self.service_id
         )
         
         self.assertEqual(offer.status, Offer.STATUS_DRAFT)
@@ -44,28 +48,31 @@ class OfferModelTest(TestCase):
         """Test that default available_slots is 1."""
         offer = Offer.objects.create(
             title="Test Offer",
-            service_id=uuid.uuid4()
+            service_id=self.service_id
         )
         
         self.assertEqual(offer.available_slots, 1)
     
     def test_offer_status_choices(self):
         """Test different status choices."""
-        service_id = uuid.uuid4()
-        
-        draft = Offer.objects.create(title="Draft", service_id=service_id, status=Offer.STATUS_DRAFT)
-        published = Offer.objects.create(title="Published", service_id=service_id, status=Offer.STATUS_PUBLISHED)
-        closed = Offer.objects.create(title="Closed", service_id=service_id, status=Offer.STATUS_CLOSED)
+        Offer.objects.bulk_create([
+            Offer(title="Draft", service_id=self.service_id, status=Offer.STATUS_DRAFT),
+            Offer(title="Published", service_id=self.service_id, status=Offer.STATUS_PUBLISHED),
+            Offer(title="Closed", service_id=self.service_id, status=Offer.STATUS_CLOSED),
+        ])
         
-        self.assertEqual(draft.status, "draft")
-        self.assertEqual(published.status, "published")
-        self.assertEqual(closed.status, "closed")
+        statuses = dict(
+            Offer.objects.filter(service_id=self.service_id).values_list('title', 'status')
+        )
+        self.assertEqual(statuses["Draft"], "draft")
+        self.assertEqual(statuses["Published"], "published")
+        self.assertEqual(statuses["Closed"], "closed")
     
     def test_offer_period_validation(self):
         """Test that period_end must be after period_start."""
         offer = Offer(
             title="Test Offer",
-            service_id=uuid.uuid4(),
+            service_id=self.service_id,
             period_start=date.today(),
             period_end=date.today() - timedelta(days=1)  # End before start
         )
@@ -79,7 +86,7 @@ class OfferModelTest(TestCase):
         """Test that available_slots cannot be negative."""
         offer = Offer(
             title="Test Offer",
-            service_id=uuid.uuid4(),
+            service_id=self.service_id,
             available_slots=-1
         )
         
@@ -96,7 +103,7 @@ class OfferModelTest(TestCase):
         }
         offer = Offer.objects.create(
             title="Premium Internship",
-            service_id=uuid.uuid4(),
+            service_id=self.service_id,
             metadata=metadata
         )
         
@@ -107,7 +114,7 @@ class OfferModelTest(TestCase):
         """Test string representation."""
         offer = Offer.objects.create(
             title="Surgery Internship",
-            service_id=uuid.uuid4(),
+            service_id=self.service_id,
             status=Offer.STATUS_PUBLISHED
         )
         
@@ -119,7 +126,7 @@ class OfferModelTest(TestCase):
         creator_id = uuid.uuid4()
         offer = Offer.objects.create(
             title="Test Offer",
-            service_id=uuid.uuid4(),
+            service_id=self.service_id,
             created_by=creator_id
         )
         
@@ -130,7 +137,7 @@ class OfferModelTest(TestCase):
         establishment_id = uuid.uuid4()
         offer = Offer.objects.create(
             title="Test Offer",
-            service_id=uuid.uuid4(),
+            service_id=self.service_id,
             establishment_id=establishment_id
         )
         
@@ -138,8 +145,8 @@ class OfferModelTest(TestCase):
     
     def test_offer_ordering(self):
         """Test that offers are ordered by created_at descending."""
-        offer1 = Offer.objects.create(title="First", service_id=uuid.uuid4())
-        offer2 = Offer.objects.create(title="Second", service_id=uuid.uuid4())
+        offer1 = Offer.objects.create(title="First", service_id=self.service_id)
+        offer2 = Offer.objects.create(title="Second", service_id=self.service_id)
         
         offers = list(Offer.objects.all())
         self.assertEqual(offers[0].title, "Second")
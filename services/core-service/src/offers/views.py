@@ -1,7 +1,7 @@
 """Views for offers app."""
-import jwt
-from django.conf import settings
-from django.db.models import Q
+import orjson
+from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -13,39 +13,37 @@ from .serializers import (
     OfferSerializer, OfferListSerializer, CreateOfferRequest,
     UpdateOfferRequest, OfferWithDetails
 )
-from utils.event_publisher import get_event_publisher
+from utils import event_worker
+from utils.event_publisher import EventPublisher
+from utils.jwt_utils import get_user_id_from_token
+from utils.pagination import CachedCountPaginator
 from utils.rbac import require_roles, get_user_role, get_user_id
 
 
+# Offer statuses accepted by update_status, and the error listing them
+_VALID_STATUSES = frozenset(s[0] for s in Offer.STATUS_CHOICES)
+_INVALID_STATUS_MSG = 'Invalid status. Must be one of: ' + ', '.join(s[0] for s in Offer.STATUS_CHOICES)
+
+# Rows fetched per round trip when streaming applications
+STREAM_CHUNK_SIZE = 500
+
+
 def get_user_id_from_request(request):
     """Extract user_id from JWT token in Authorization header."""
     auth_header = request.META.get('HTTP_AUTHORIZATION', '')
     if not auth_header:
         return None
     
-    try:
-        parts = auth_header.split()
-        if len(parts) != 2 or parts[0].lower() != 'bearer':
-            return None
-        
-        token = parts[1]
-        secret_key = getattr(settings, 'JWT_SECRET_KEY', settings.SECRET_KEY)
-        algorithm = getattr(settings, 'JWT_ALGORITHM', 'HS256')
-        
-        payload = jwt.decode(
-            token,
-            secret_key,
-            algorithms=[algorithm],
-            options={"verify_signature": True}
-        )
-        
-        return payload.get('user_id') or payload.get('sub') or payload.get('id')
-    except (jwt.InvalidTokenError, jwt.ExpiredSignatureError, KeyError):
+    parts = auth_header.split()
+    if len(parts) != 2 or parts[0].lower() != 'bearer':
         return None
+    
+    return get_user_id_from_token(parts[1])
 
 
 class OfferPagination(PageNumberPagination):
     """Custom pagination for offers."""
+    django_paginator_class = CachedCountPaginator
     page_size = 20
     page_size_query_param = 'per_page'
     max_page_size = 100
@@ -77,7 +75,7 @@ class OfferFilter(filters.FilterSet):
         return queryset
     
     def filter_search(self, queryset, name, value):
-        """Search in title and description."""
+        """Search in title and description (ILIKE, served by the pg_trgm GIN indexes)."""
         if value:
             return queryset.filter(
                 Q(title__icontains=value) | Q(description__icontains=value)
@@ -92,17 +90,45 @@ class OfferViewSet(viewsets.ModelViewSet):
     filterset_class = OfferFilter
     pagination_class = OfferPagination
     
-    def get_serializer_class(self):
-        """Use appropriate serializer for each action."""
+    # Columns rendered by OfferListSerializer; list skips description/metadata.
+    # Derived from the serializer so a new list field is never lazy-loaded per row.
+    LIST_FIELDS = tuple(
+        f for f in OfferListSerializer.Meta.fields if f != 'accepted_count'
+    )
+    
+    # Serializer per action; anything else falls back to OfferSerializer
+    SERIALIZER_MAP = {
+        'list': OfferListSerializer,
+        'retrieve': OfferWithDetails,
+        'create': CreateOfferRequest,
+        'update': UpdateOfferRequest,
+        'partial_update': UpdateOfferRequest,
+    }
+    
+    def get_queryset(self):
+        """Only load the columns the list serializer renders."""
+        queryset = super().get_queryset()
         if self.action == 'list':
-            return OfferListSerializer
+            queryset = queryset.only(*self.LIST_FIELDS).annotate(
+                accepted_count=Count(
+                    'applications',
+                    filter=Q(applications__status='accepted')
+                )
+            )
         elif self.action == 'retrieve':
-            return OfferWithDetails
-        elif self.action == 'create':
-            return CreateOfferRequest
-        elif self.action in ['update', 'partial_update']:
-            return UpdateOfferRequest
-        return OfferSerializer
+            # OfferWithDetails reports both counts; compute them in one query
+            queryset = queryset.annotate(
+                application_count=Count('applications'),
+                accepted_count=Count(
+                    'applications',
+                    filter=Q(applications__status='accepted')
+                )
+            )
+        return queryset
+    
+    def get_serializer_class(self):
+        """Use appropriate serializer for each action."""
+        return self.SERIALIZER_MAP.get(self.action, OfferSerializer)
     
     def create(self, request):
         """Create a new internship offer (encadrant/admin only)."""
@@ -130,25 +156,23 @@ class OfferViewSet(viewsets.ModelViewSet):
             establishment_id=serializer.validated_data.get('establishment_id'),
             period_start=serializer.validated_data.get('period_start'),
             period_end=serializer.validated_data.get('period_end'),
+            available_slots=serializer.validated_data.get('available_slots', 1),
+            metadata=serializer.validated_data.get('metadata'),
             created_by=user_id,
             status=serializer.validated_data.get('status', 'draft')
         )
         
-        # Publish offer.created event
-        publisher = get_event_publisher()
-        publisher.publish_offer_created({
-            'offer_id': str(offer.id),
+        # Publish offer.created event (orjson renders the UUIDs on the worker)
+        event_worker.enqueue(EventPublisher.OFFER_CREATED, {
+            'offer_id': offer.id,
             'title': offer.title,
-            'service_id': str(offer.service_id),
-            'establishment_id': str(offer.establishment_id) if offer.establishment_id else None,
-            'created_by': str(user_id) if user_id else None,
+            'service_id': offer.service_id,
+            'establishment_id': offer.establishment_id,
+            'created_by': user_id or None,
             'status': offer.status
         })
         
-        return Response(
-            OfferSerializer(offer).data,
-            status=status.HTTP_201_CREATED
-        )
+        return Response(OfferSerializer(offer).data, status=status.HTTP_201_CREATED)
     
     def update(self, request, pk=None):
         """Update an entire offer (PUT - encadrant/admin only)."""
@@ -175,9 +199,8 @@ class OfferViewSet(viewsets.ModelViewSet):
         offer.save()
         
         # Publish offer.updated event
-        publisher = get_event_publisher()
-        publisher.publish_offer_updated({
-            'offer_id': str(offer.id),
+        event_worker.enqueue(EventPublisher.OFFER_UPDATED, {
+            'offer_id': offer.id,
             'title': offer.title,
             'status': offer.status
         })
@@ -209,9 +232,8 @@ class OfferViewSet(viewsets.ModelViewSet):
         offer.save()
         
         # Publish offer.updated event
-        publisher = get_event_publisher()
-        publisher.publish_offer_updated({
-            'offer_id': str(offer.id),
+        event_worker.enqueue(EventPublisher.OFFER_UPDATED, {
+            'offer_id': offer.id,
             'title': offer.title,
             'status': offer.status
         })
@@ -233,17 +255,16 @@ class OfferViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        offer_id = str(offer.id)
+        offer_id = offer.id
         offer_title = offer.title
         
         # Delete the offer
         offer.delete()
         
         # Publish offer.deleted event
-        publisher = get_event_publisher()
-        publisher.publish_event(
-            routing_key='core.offer.deleted',
-            payload={
+        event_worker.enqueue(
+            EventPublisher.OFFER_DELETED,
+            {
                 'offer_id': offer_id,
                 'title': offer_title
             }
@@ -275,9 +296,9 @@ class OfferViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if new_status not in dict(Offer.STATUS_CHOICES):
+        if new_status not in _VALID_STATUSES:
             return Response(
-                {'error': f'Invalid status. Must be one of: {", ".join([s[0] for s in Offer.STATUS_CHOICES])}'},
+                {'error': _INVALID_STATUS_MSG},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
@@ -286,20 +307,19 @@ class OfferViewSet(viewsets.ModelViewSet):
         offer.save()
         
         # Publish appropriate event based on new status
-        publisher = get_event_publisher()
         event_data = {
-            'offer_id': str(offer.id),
+            'offer_id': offer.id,
             'title': offer.title,
             'status': new_status,
             'old_status': old_status
         }
         
         if new_status == 'published':
-            publisher.publish_offer_published(event_data)
+            event_worker.enqueue(EventPublisher.OFFER_PUBLISHED, event_data)
         elif new_status == 'closed':
-            publisher.publish_offer_closed(event_data)
+            event_worker.enqueue(EventPublisher.OFFER_CLOSED, event_data)
         else:
-            publisher.publish_offer_updated(event_data)
+            event_worker.enqueue(EventPublisher.OFFER_UPDATED, event_data)
         
         serializer = OfferSerializer(offer)
         return Response(serializer.data)
@@ -309,6 +329,7 @@ class OfferViewSet(viewsets.ModelViewSet):
         """Get applications for this offer."""
         from applications.models import Application
         from applications.serializers import ApplicationSerializer
+        from applications.views import ApplicationPagination
         
         offer = self.get_object()
         applications = Application.objects.filter(offer=offer)
@@ -318,44 +339,19 @@ class OfferViewSet(viewsets.ModelViewSet):
         if status_filter:
             applications = applications.filter(status=status_filter)
         
-        # Pagination
-        page = request.query_params.get('page', 1)
-        per_page = request.query_params.get('per_page', 20)
-        
-        try:
-            page = int(page)
-            per_page = min(int(per_page), 100)  # Max 100 per page
-        except (ValueError, TypeError):
-            page = 1
-            per_page = 20
-        
-        # Manual pagination
-        start = (page - 1) * per_page
-        end = start + per_page
-        total_count = applications.count()
+        # ?stream=1 exports every match as NDJSON without building a page in memory
+        if request.query_params.get('stream') == '1':
+            rows = applications.order_by('-submitted_at', '-id').iterator(
+                chunk_size=STREAM_CHUNK_SIZE
+            )
+            return StreamingHttpResponse(
+                (orjson.dumps(ApplicationSerializer(row).data) + b'\n' for row in rows),
+                content_type='application/x-ndjson'
+            )
         
-        applications_page = applications[start:end]
+        # Keyset pagination (?cursor=&per_page=) with a cached approximate count
+        paginator = ApplicationPagination()
+        applications_page = paginator.paginate_queryset(applications, request, view=self)
         
         serializer = ApplicationSerializer(applications_page, many=True)
-        
-        # Build pagination response
-        base_url = request.build_absolute_uri().split('?')[0]
-        next_url = None
-        prev_url = None
-        
-        if end < total_count:
-            next_url = f"{base_url}?page={page + 1}&per_page={per_page}"
-            if status_filter:
-                next_url += f"&status={status_filter}"
-        
-        if page > 1:
-            prev_url = f"{base_url}?page={page - 1}&per_page={per_page}"
-            if status_filter:
-                prev_url += f"&status={status_filter}"
-        
-        return Response({
-            'count': total_count,
-            'next': next_url,
-            'previous': prev_url,
-            'results': serializer.data
-        })
+        return paginator.get_paginated_response(serializer.data)
@@ -1,10 +1,68 @@
 """Enhanced RabbitMQ publisher for Core-Service events."""
+import logging
 import os
-import json
+import threading
+import time
+import orjson
 import pika
 import uuid
-from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Persistent JSON messages; identical for every event so built only once
+_MESSAGE_PROPERTIES = pika.BasicProperties(
+    delivery_mode=2,  # Persistent message
+    content_type='application/json'
+)
+
+# Bounds (seconds) for the delay between reconnect attempts
+RECONNECT_BACKOFF_MIN = 0.5
+RECONNECT_BACKOFF_MAX = 30.0
+
+# Random bytes drawn per os.urandom call when generating event ids
+_RNG_BUF_SIZE = 4096
+_rng_buf = b''
+_rng_pos = 0
+_rng_lock = threading.Lock()
+
+
+def _reset_rng_buf():
+    """Discard buffered entropy so forked workers never share ids."""
+    global _rng_buf, _rng_pos
+    _rng_buf = b''
+    _rng_pos = 0
+
+
+os.register_at_fork(after_in_child=_reset_rng_buf)
+
+
+def _fast_uuid4() -> str:
+    """Return a random (version 4) UUID string, reading urandom in bulk."""
+    global _rng_buf, _rng_pos
+    with _rng_lock:
+        if _rng_pos + 16 > len(_rng_buf):
+            _rng_buf = os.urandom(_RNG_BUF_SIZE)
+            _rng_pos = 0
+        chunk = _rng_buf[_rng_pos:_rng_pos + 16]
+        _rng_pos += 16
+    return str(uuid.UUID(bytes=chunk, version=4))
+
+
+# (second, 'YYYY-MM-DDTHH:MM:SS') for the most recent timestamp formatted
+_ts_cache = (0, '')
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO 8601, re-formatting the date part once per second."""
+    global _ts_cache
+    now_us = time.time_ns() // 1000
+    sec, usec = divmod(now_us, 1_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f'{prefix}.{usec:06d}'
 
 
 class EventPublisher:
@@ -38,9 +96,15 @@ class EventPublisher:
         self.exchange_type = 'topic'  # Topic exchange for flexible routing
         self.connection = None
         self.channel = None
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._declared_exchanges = set()
     
     def connect(self):
-        """Establish connection to RabbitMQ."""
+        """Establish connection to RabbitMQ, backing off after failures."""
+        now = time.monotonic()
+        if now < self._retry_at:
+            return False
         try:
             credentials = pika.PlainCredentials('admin', 'password')  # Changed from 'guest', 'guest'
             parameters = pika.ConnectionParameters(
@@ -59,12 +123,43 @@ class EventPublisher:
                 exchange_type=self.exchange_type,
                 durable=True
             )
+            self._declared_exchanges = {self.exchange_name}
             
+            self._backoff = 0.0
             return True
         except Exception as e:
-            print(f"Failed to connect to RabbitMQ: {e}")
+            self._backoff = min(
+                max(self._backoff * 2, RECONNECT_BACKOFF_MIN),
+                RECONNECT_BACKOFF_MAX
+            )
+            self._retry_at = now + self._backoff
+            logger.warning("Failed to connect to RabbitMQ (retry in %.1fs): %s", self._backoff, e)
             return False
     
+    def _ensure_connected(self) -> bool:
+        """Reconnect if the connection was never opened or has dropped."""
+        if self.connection is None or self.connection.is_closed:
+            return self.connect()
+        return True
+    
+    def _publish(self, event_type: str, payload: Dict[Any, Any], correlation_id: Optional[str]) -> str:
+        """Wrap payload in the event envelope, publish it and return its id."""
+        event = {
+            'event_id': _fast_uuid4(),
+            'event_type': event_type,
+            'timestamp': _utc_timestamp(),
+            'correlation_id': correlation_id or _fast_uuid4(),
+            'source': 'core-service',
+            'data': payload
+        }
+        self.channel.basic_publish(
+            exchange=self.exchange_name,
+            routing_key=event_type,  # Topic routing key
+            body=orjson.dumps(event),
+            properties=_MESSAGE_PROPERTIES
+        )
+        return event['event_id']
+    
     def publish_event(
         self,
         event_type: str,
@@ -83,37 +178,79 @@ class EventPublisher:
             True if published successfully, False otherwise
         """
         try:
-            if not self.connection or self.connection.is_closed:
-                if not self.connect():
-                    return False
+            if not self._ensure_connected():
+                return False
             
-            # Create event envelope
-            event = {
-                'event_id': str(uuid.uuid4()),
-                'event_type': event_type,
-                'timestamp': datetime.utcnow().isoformat(),
-                'correlation_id': correlation_id or str(uuid.uuid4()),
-                'source': 'core-service',
-                'data': payload
-            }
+            event_id = self._publish(event_type, payload, correlation_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Published event: %s (ID: %s)", event_type, event_id)
+            return True
             
-            # Publish with persistence
-            self.channel.basic_publish(
-                exchange=self.exchange_name,
-                routing_key=event_type,  # Topic routing key
-                body=json.dumps(event),
-                properties=pika.BasicProperties(
-                    delivery_mode=2,  # Persistent message
-                    content_type='application/json',
-                    correlation_id=event['correlation_id']
+        except Exception as e:
+            logger.error("Failed to publish event %s: %s", event_type, e)
+            return False
+    
+    def publish_batch(self, events: Iterable[Tuple[str, Dict[Any, Any]]]) -> int:
+        """
+        Publish several (event_type, payload) pairs over the same channel.
+        
+        The connection is checked once per batch rather than per message.
+        Returns the number of events published; on error the rest of the
+        batch is dropped.
+        """
+        events = list(events)
+        if not events or not self._ensure_connected():
+            return 0
+        
+        published = 0
+        try:
+            for event_type, payload in events:
+                self._publish(event_type, payload, None)
+                published += 1
+        except Exception as e:
+            logger.error("Failed to publish batch (%d events dropped): %s", len(events) - published, e)
+        return published
+    
+    def publish_raw(
+        self,
+        exchange: str,
+        routing_key: str,
+        message: Dict[Any, Any],
+        exchange_type: str = 'topic'
+    ) -> bool:
+        """
+        Publish a bare message (no event envelope) to any exchange.
+        
+        The exchange is declared durable the first time it is used on
+        the current connection.
+        
+        Returns:
+            True if published successfully, False otherwise
+        """
+        try:
+            if not self._ensure_connected():
+                return False
+            
+            if exchange not in self._declared_exchanges:
+                self.channel.exchange_declare(
+                    exchange=exchange,
+                    exchange_type=exchange_type,
+                    durable=True
                 )
-            )
+                self._declared_exchanges.add(exchange)
             
-            print(f"✅ Published event: {event_type} (ID: {event['event_id']})")
+            self.channel.basic_publish(
+                exchange=exchange,
+                routing_key=routing_key,
+                body=orjson.dumps(message),
+                properties=_MESSAGE_PROPERTIES
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Published message to %s/%s", exchange, routing_key)
             return True
             
         except Exception as e:
-            print(f"❌ Failed to publish event {event_type}: {e}")
+            logger.error("Failed to publish message to %s/%s: %s", exchange, routing_key, e)
             return False
     
     def publish_offer_created(self, offer_data: Dict[Any, Any]) -> bool:
@@ -180,16 +317,16 @@ class EventPublisher:
             if self.connection and not self.connection.is_closed:
                 self.connection.close()
         except Exception as e:
-            print(f"Error closing RabbitMQ connection: {e}")
+            logger.warning("Error closing RabbitMQ connection: %s", e)
 
 
-# Singleton instance
-_publisher = None
+# One publisher per thread: a pika BlockingConnection must not be shared
+_local = threading.local()
 
 
 def get_event_publisher() -> EventPublisher:
-    """Get singleton EventPublisher instance."""
-    global _publisher
-    if _publisher is None:
-        _publisher = EventPublisher()
-    return _publisher
+    """Get the calling thread's EventPublisher instance."""
+    publisher = getattr(_local, 'publisher', None)
+    if publisher is None:
+        publisher = _local.publisher = EventPublisher()
+    return publisher
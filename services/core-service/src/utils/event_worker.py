@@ -0,0 +1,85 @@
+"""Background delivery of RabbitMQ events off the request path."""
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Dict
+
+from utils.event_publisher import get_event_publisher
+
+logger = logging.getLogger(__name__)
+
+# Bound the backlog so a broker outage cannot grow memory without limit
+_queue = queue.Queue(maxsize=10000)
+_STOP = object()
+_worker = None
+_worker_lock = threading.Lock()
+
+# Maximum number of queued events sent per connection check
+BATCH_SIZE = 64
+
+# Seconds to wait for queued events to be flushed at interpreter exit
+SHUTDOWN_TIMEOUT = 5
+
+
+def _run():
+    """Publish queued events in batches until the stop sentinel is received."""
+    publisher = get_event_publisher()
+    stopping = False
+    while not stopping:
+        batch = [_queue.get()]
+        while len(batch) < BATCH_SIZE:
+            try:
+                batch.append(_queue.get_nowait())
+            except queue.Empty:
+                break
+        events = [item for item in batch if item is not _STOP]
+        stopping = len(events) != len(batch)
+        try:
+            publisher.publish_batch(events)
+        except Exception:
+            logger.exception("Event worker failed to publish")
+        finally:
+            for _ in batch:
+                _queue.task_done()
+    publisher.close()
+
+
+def _ensure_worker():
+    """Start the worker thread lazily, once per process (safe after fork)."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='event-publisher', daemon=True)
+            _worker.start()
+
+
+def enqueue(event_type: str, payload: Dict[Any, Any]) -> bool:
+    """
+    Queue an event for publishing and return immediately.
+
+    Returns False (and drops the event) when the queue is full.
+    """
+    _ensure_worker()
+    try:
+        _queue.put_nowait((event_type, payload))
+    except queue.Full:
+        logger.warning("Event queue full, dropping %s", event_type)
+        return False
+    return True
+
+
+def _shutdown():
+    """Drain pending events before the process exits."""
+    if _worker is None or not _worker.is_alive():
+        return
+    try:
+        _queue.put(_STOP, timeout=SHUTDOWN_TIMEOUT)
+    except queue.Full:
+        return
+    _worker.join(SHUTDOWN_TIMEOUT)
+
+
+atexit.register(_shutdown)
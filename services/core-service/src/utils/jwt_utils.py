@@ -0,0 +1,36 @@
+"""Cached JWT decoding for views that read the user id from the token."""
+import time
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import jwt
+from django.conf import settings
+
+# JWT decode arguments resolved once at import instead of on every request
+_JWT_KEY = getattr(settings, 'JWT_SECRET_KEY', None) or settings.SECRET_KEY
+_JWT_ALGS = [getattr(settings, 'JWT_ALGORITHM', 'HS256')]
+_JWT_OPTS = {"verify_signature": True}
+
+
+@lru_cache(maxsize=4096)
+def _decode(token: str) -> Tuple[Optional[str], Optional[float]]:
+    """Verify a token once and remember (user_id, exp) for it."""
+    payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGS, options=_JWT_OPTS)
+    user_id = payload.get('user_id') or payload.get('sub') or payload.get('id')
+    return user_id, payload.get('exp')
+
+
+def get_user_id_from_token(token: str) -> Optional[str]:
+    """
+    Return the user id carried by a token, or None if it is invalid.
+
+    Verified tokens are cached, so repeated calls with the same token skip
+    the HMAC check until the token's own expiry.
+    """
+    try:
+        user_id, exp = _decode(token)
+    except jwt.PyJWTError:
+        return None
+    if exp is not None and exp <= time.time():
+        return None
+    return user_id
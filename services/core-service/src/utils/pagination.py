@@ -0,0 +1,67 @@
+"""Pagination helpers shared by core-service list endpoints."""
+import hashlib
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
+
+# How long (seconds) a filtered COUNT(*) result is reused
+COUNT_CACHE_TIMEOUT = 30
+
+
+def _estimated_table_rows(model):
+    """Read the planner's row estimate for a table from pg_class."""
+    if connection.vendor != 'postgresql':
+        return None
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [table]
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 until the table has been vacuumed/analyzed
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+def cached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """Exact COUNT(*) for a queryset, reused for `timeout` seconds per SQL."""
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    key = 'count:' + hashlib.blake2b(
+        f"{sql}|{params}".encode(), digest_size=12
+    ).hexdigest()
+    return cache.get_or_set(key, queryset.count, timeout)
+
+
+def approximate_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """
+    Return a cheap, possibly stale row count for a queryset.
+
+    Unfiltered querysets use the Postgres table statistics; filtered ones
+    run COUNT(*) at most once per `timeout` seconds for the same SQL.
+    """
+    if not queryset.query.where:
+        estimate = _estimated_table_rows(queryset.model)
+        if estimate is not None:
+            return estimate
+    return cached_count(queryset, timeout)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Django paginator whose total comes from cached_count().
+
+    Page numbers stay exact (no planner estimates), but the COUNT(*) is
+    shared between requests with the same filters for a short while.
+    """
+
+    @cached_property
+    def count(self):
+        return cached_count(self.object_list)
@@ -1,5 +1,6 @@
 """Service client utilities for cross-service communication via Consul."""
 import os
+import threading
 import requests
 import consul
 import logging
@@ -135,13 +136,16 @@ class ProfileServiceClient(ServiceClient):
 # Singleton instances
 _auth_client = None
 _profile_client = None
+_clients_lock = threading.Lock()
 
 
 def get_auth_client() -> AuthServiceClient:
     """Get singleton AuthServiceClient."""
     global _auth_client
     if _auth_client is None:
-        _auth_client = AuthServiceClient()
+        with _clients_lock:
+            if _auth_client is None:
+                _auth_client = AuthServiceClient()
     return _auth_client
 
 
@@ -149,5 +153,7 @@ def get_profile_client() -> ProfileServiceClient:
     """Get singleton ProfileServiceClient."""
     global _profile_client
     if _profile_client is None:
-        _profile_client = ProfileServiceClient()
+        with _clients_lock:
+            if _profile_client is None:
+                _profile_client = ProfileServiceClient()
     return _profile_client
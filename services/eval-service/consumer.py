@@ -1,7 +1,10 @@
 """RabbitMQ consumer for EVAL-SERVICE - Attendance creation."""
 import os
 import sys
-import json
+import logging
+import threading
+import uuid
+import orjson
 import pika
 import django
 from time import sleep
@@ -11,8 +14,28 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eval_service.settings')
 django.setup()
 
+from django.db import InterfaceError, OperationalError
 from attendance.models import AttendanceRecord, AttendanceSummary
 
+log = logging.getLogger(__name__)
+
+# Attendance summaries are inserted in batches of up to BATCH_SIZE messages,
+# or after FLUSH_INTERVAL seconds, whichever comes first
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 0.5
+
+# Independent consumers (one connection, channel and DB connection each)
+# sharing the queue; RabbitMQ round-robins deliveries between them
+CONSUMER_WORKERS = int(os.environ.get('CONSUMER_WORKERS', '4'))
+
+
+def _parse_uuid(value):
+    """Return value as a UUID, or None if it is missing or malformed."""
+    try:
+        return uuid.UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
 
 class EvalServiceConsumer:
     """Consumer for eval-service to handle offer events."""
@@ -22,10 +45,14 @@ class EvalServiceConsumer:
         self.port = int(os.environ.get('RABBITMQ_PORT', '5672'))
         self.exchange_name = 'medtrack.events'
         self.queue_name = 'eval.offers'
+        self._connection = None
+        self._pending = []
+        self._pending_tags = []
+        self._flush_scheduled = False
         
     def connect(self):
         """Connect to RabbitMQ and setup queue."""
-        print(f"Connecting to RabbitMQ at {self.host}:{self.port}...")
+        log.info("Connecting to RabbitMQ at %s:%s...", self.host, self.port)
         
         credentials = pika.PlainCredentials('admin', 'password')  # Changed from 'guest', 'guest'
         parameters = pika.ConnectionParameters(
@@ -60,7 +87,7 @@ class EvalServiceConsumer:
             routing_key='core.affectation.created'  # Student assignments
         )
         
-        print(f"✅ Connected! Listening for events on queue: {self.queue_name}")
+        log.info("✅ Connected! Listening for events on queue: %s", self.queue_name)
         return connection, channel
     
     def handle_offer_published(self, event_data):
@@ -74,8 +101,7 @@ class EvalServiceConsumer:
         offer_id = event_data.get('offer_id')
         title = event_data.get('title', 'Unknown')
         
-        print(f"📢 Offer Published: {title} (ID: {offer_id})")
-        print(f"   Ready to track attendance for this offer")
+        log.info("📢 Offer Published: %s (ID: %s) - ready to track attendance", title, offer_id)
     
     def handle_affectation_created(self, event_data):
         """
@@ -84,52 +110,106 @@ class EvalServiceConsumer:
         When a student is assigned to an offer:
         - Create AttendanceSummary for tracking
         - Prepare evaluation template
+        
+        Returns the unsaved summary, or None if the event lacks a valid
+        student_id/offer_id; process_message batches the INSERTs.
         """
-        student_id = event_data.get('student_id')
-        offer_id = event_data.get('offer_id')
+        student_id = _parse_uuid(event_data.get('student_id'))
+        offer_id = _parse_uuid(event_data.get('offer_id'))
         offer_title = event_data.get('offer_title', 'Unknown')
         affectation_id = event_data.get('affectation_id')
         
-        print(f"✅ Student Assigned: {student_id}")
-        print(f"   Offer: {offer_title}")
-        print(f"   Creating attendance tracking...")
+        if student_id is None or offer_id is None:
+            log.error("❌ Invalid affectation %s: student_id=%r offer_id=%r",
+                      affectation_id, event_data.get('student_id'), event_data.get('offer_id'))
+            return None
         
-        # Create attendance summary
+        log.info("✅ Student Assigned: %s to offer %s, creating attendance tracking", student_id, offer_title)
+        
+        return AttendanceSummary(
+            student_id=student_id,
+            offer_id=offer_id,
+            total_days=0,
+            present_days=0,
+            validated=False
+        )
+    
+    def flush(self, ch):
+        """Insert pending summaries in one statement and ack their messages at once."""
+        if not self._pending:
+            return
+        batch, tags = self._pending, self._pending_tags
+        self._pending, self._pending_tags = [], []
         try:
-            AttendanceSummary.objects.create(
-                student_id=student_id,
-                offer_id=offer_id,
-                total_days=0,
-                present_days=0,
-                presence_rate=0.0,
-                validated=False
-            )
-            print(f"   ✅ Attendance summary created")
+            # Existing (student, offer) summaries are skipped, as before
+            AttendanceSummary.objects.bulk_create(batch, ignore_conflicts=True)
+        except (OperationalError, InterfaceError) as e:
+            # Database unreachable: nothing is wrong with the messages, retry them later
+            log.error("❌ Error creating %d summaries: %s", len(batch), e)
+            ch.basic_nack(delivery_tag=max(tags), multiple=True, requeue=True)
+            return
         except Exception as e:
-            print(f"   ⚠️ Error creating summary: {e}")
+            log.error("❌ Error creating %d summaries, retrying one by one: %s", len(batch), e)
+            self._insert_one_by_one(ch, batch, tags)
+            return
+        # Everything up to max(tags) not already acked is one of ours
+        ch.basic_ack(delivery_tag=max(tags), multiple=True)
+        log.debug("Attendance summaries created: %d", len(batch))
+    
+    def _insert_one_by_one(self, ch, batch, tags):
+        """Insert a failed batch row by row; ack the good rows, drop the bad ones."""
+        for summary, tag in zip(batch, tags):
+            try:
+                AttendanceSummary.objects.bulk_create([summary], ignore_conflicts=True)
+            except (OperationalError, InterfaceError) as e:
+                log.error("❌ Error creating summary: %s", e)
+                ch.basic_nack(delivery_tag=tag, requeue=True)
+            except Exception as e:
+                # A row that cannot be stored would fail on every redelivery
+                log.error("❌ Dropping affectation for %s/%s: %s", summary.student_id, summary.offer_id, e)
+                ch.basic_nack(delivery_tag=tag, requeue=False)
+            else:
+                ch.basic_ack(delivery_tag=tag)
+    
+    def _flush_on_timer(self, ch):
+        """Flush whatever accumulated since the timer was scheduled."""
+        self._flush_scheduled = False
+        self.flush(ch)
     
     def process_message(self, ch, method, properties, body):
         """Process incoming RabbitMQ message."""
         try:
-            # Parse event
-            event = json.loads(body)
+            # Parse event (orjson decodes the bytes body directly)
+            event = orjson.loads(body)
             event_type = event.get('event_type')
             data = event.get('data', {})
             
-            print(f"\n📨 Received: {event_type}")
+            log.debug("📨 Received: %s", event_type)
             
             # Route to appropriate handler
             if event_type == 'core.offer.published':
                 self.handle_offer_published(data)
             elif event_type == 'core.affectation.created':
-                self.handle_affectation_created(data)
+                summary = self.handle_affectation_created(data)
+                if summary is None:
+                    # Malformed event: redelivering it can never succeed
+                    ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+                    return
+                self._pending.append(summary)
+                self._pending_tags.append(method.delivery_tag)
+                if len(self._pending) >= BATCH_SIZE:
+                    self.flush(ch)
+                elif not self._flush_scheduled:
+                    self._flush_scheduled = True
+                    self._connection.call_later(FLUSH_INTERVAL, lambda: self._flush_on_timer(ch))
+                return
             
             # Acknowledge message
             ch.basic_ack(delivery_tag=method.delivery_tag)
-            print("✅ Message processed successfully")
+            log.debug("Message processed successfully")
             
         except Exception as e:
-            print(f"❌ Error processing message: {e}")
+            log.error("❌ Error processing message: %s", e)
             # Reject and requeue on error
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
     
@@ -138,9 +218,13 @@ class EvalServiceConsumer:
         while True:
             try:
                 connection, channel = self.connect()
+                self._connection = connection
+                # Unacked messages from a lost channel are redelivered
+                self._pending, self._pending_tags = [], []
+                self._flush_scheduled = False
                 
-                # Set QoS
-                channel.basic_qos(prefetch_count=1)
+                # Set QoS (enough in flight to fill a batch)
+                channel.basic_qos(prefetch_count=BATCH_SIZE)
                 
                 # Start consuming
                 channel.basic_consume(
@@ -148,18 +232,26 @@ class EvalServiceConsumer:
                     on_message_callback=self.process_message
                 )
                 
-                print("\n🎧 Waiting for messages. Press CTRL+C to exit.\n")
+                log.info("🎧 Waiting for messages. Press CTRL+C to exit.")
                 channel.start_consuming()
                 
             except KeyboardInterrupt:
-                print("\n👋 Shutting down consumer...")
+                log.info("👋 Shutting down consumer...")
                 break
             except Exception as e:
-                print(f"❌ Connection error: {e}")
-                print("Reconnecting in 5 seconds...")
+                log.error("❌ Connection error: %s - reconnecting in 5 seconds", e)
                 sleep(5)
 
 
 if __name__ == '__main__':
+    # Django's LOGGING already installed the root handler; only the level is tunable
+    logging.getLogger().setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+    for i in range(1, CONSUMER_WORKERS):
+        threading.Thread(
+            target=EvalServiceConsumer().start_consuming,
+            name=f'eval-consumer-{i}',
+            daemon=True
+        ).start()
+    # The main thread consumes too, and handles CTRL+C for the process
     consumer = EvalServiceConsumer()
     consumer.start_consuming()
@@ -3,17 +3,31 @@ from django.contrib import admin
 from .models import AttendanceRecord, AttendanceSummary
 
 
+class ListDisplayOnlyMixin:
+    """Load only the list_display columns on the change list page."""
+    list_per_page = 50
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # The change form and delete views still need whole rows
+        match = request.resolver_match
+        if match is not None and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.list_display)
+        return queryset
+
+
 @admin.register(AttendanceRecord)
-class AttendanceRecordAdmin(admin.ModelAdmin):
+class AttendanceRecordAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     """Admin for attendance records."""
     list_display = ['student_id', 'offer_id', 'date', 'is_present', 'justified', 'marked_at']
     list_filter = ['is_present', 'justified', 'date']
     search_fields = ['student_id', 'offer_id']
     date_hierarchy = 'date'
+    ordering = ['-date']
 
 
 @admin.register(AttendanceSummary)
-class AttendanceSummaryAdmin(admin.ModelAdmin):
+class AttendanceSummaryAdmin(ListDisplayOnlyMixin, admin.ModelAdmin):
     """Admin for attendance summaries."""
     list_display = ['student_id', 'offer_id', 'total_days', 'present_days', 'presence_rate', 'validated']
     list_filter = ['validated']
@@ -1,7 +1,10 @@
 """Models for attendance app - daily presence tracking and summaries."""
 import uuid
+from decimal import Decimal
 from django.db import models
-from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Q, Value
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.core.validators import MinValueValidator
 
 
 class AttendanceRecord(models.Model):
@@ -19,11 +22,22 @@ class AttendanceRecord(models.Model):
     
     class Meta:
         db_table = 'attendance_records'
-        ordering = ['-date']
+        # No default ordering: no index leads with date, so an implicit
+        # ORDER BY date would sort every unqualified query. Callers that need
+        # an order ask for it (the viewset and admin use '-date').
         unique_together = [['student_id', 'offer_id', 'date']]
         indexes = [
-            models.Index(fields=['student_id']),
+            # Also serves plain student_id lookups (leftmost column)
+            models.Index(fields=['student_id', '-date'], name='att_rec_student_date_desc'),
             models.Index(fields=['offer_id', 'date']),
+            # List endpoint: offer (+ student) filters, newest first
+            models.Index(fields=['offer_id', 'student_id', '-date'], name='att_rec_offer_student_date'),
+            # Absences are a small minority of rows; keeps absence scans cheap
+            models.Index(
+                fields=['offer_id', 'date'],
+                condition=Q(is_present=False),
+                name='att_rec_absent_partial'
+            ),
         ]
     
     def __str__(self):
@@ -39,13 +53,20 @@ class AttendanceSummary(models.Model):
     offer_id = models.UUIDField()
     total_days = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     present_days = models.IntegerField(default=0, validators=[MinValueValidator(0)])
-    # Note: presence_rate is calculated in PostgreSQL as GENERATED column
-    # We store it here but it should be read-only from app perspective
-    presence_rate = models.DecimalField(
-        max_digits=5, 
-        decimal_places=2, 
-        default=0,
-        validators=[MinValueValidator(0), MaxValueValidator(100)],
+    # Computed by PostgreSQL (GENERATED ALWAYS AS ... STORED); never written by
+    # the app. Reload the instance (refresh_from_db) to read it after a save.
+    presence_rate = models.GeneratedField(
+        expression=Coalesce(
+            Round(
+                Cast('present_days', models.DecimalField(max_digits=12, decimal_places=4)) * 100
+                / NullIf('total_days', 0),
+                2
+            ),
+            Value(Decimal('0')),
+            output_field=models.DecimalField(max_digits=5, decimal_places=2)
+        ),
+        output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        db_persist=True,
         help_text="Automatically calculated: (present_days / total_days) * 100"
     )
     validated = models.BooleanField(default=False, help_text="Has ≥80% presence rate")
@@ -56,17 +77,13 @@ class AttendanceSummary(models.Model):
         unique_together = [['student_id', 'offer_id']]
         indexes = [
             models.Index(fields=['student_id', 'offer_id']),
+            # Summary list: per-offer ranking by presence rate
+            models.Index(fields=['offer_id', '-presence_rate'], name='att_sum_offer_rate_desc'),
         ]
     
     def __str__(self):
         return f"{self.student_id} - {self.offer_id} - {self.presence_rate}%"
     
-    def calculate_presence_rate(self):
-        """Calculate presence rate."""
-        if self.total_days == 0:
-            return 0
-        return round((self.present_days / self.total_days) * 100, 2)
-    
     def check_validation(self):
         """Check if presence rate meets ≥80% requirement."""
         return self.presence_rate >= 80
@@ -1,8 +1,83 @@
 """Serializers for attendance app."""
+import logging
 from rest_framework import serializers
 from django.utils import timezone
+from django.db import models
 from .models import AttendanceRecord, AttendanceSummary
-from utils.service_client import get_profile_client
+from utils.service_client import get_core_client, get_profile_client, gather, submit_many
+
+logger = logging.getLogger(__name__)
+
+
+def _student_summary(student):
+    """Keep only the student fields exposed by attendance payloads."""
+    if not student:
+        return None
+    return {
+        'first_name': student.get('first_name'),
+        'last_name': student.get('last_name'),
+        'student_number': student.get('student_number'),
+    }
+
+
+# Rendered for offers CORE-SERVICE could not return; shared, never mutated
+_MISSING_OFFER = {'title': None, 'period_start': None, 'period_end': None}
+
+
+def _offer_summary(offer):
+    """Keep only the offer fields exposed by attendance payloads."""
+    if not offer:
+        return _MISSING_OFFER
+    return {
+        'title': offer.get('title'),
+        'period_start': offer.get('period_start'),
+        'period_end': offer.get('period_end'),
+    }
+
+
+class StudentBatchingListSerializer(serializers.ListSerializer):
+    """
+    List serializer that prefetches every student of the page in one go.
+    
+    The lookups are stored in context['students_map'] so the child's
+    get_student() does not make one PROFILE-SERVICE call per row.
+    """
+    
+    def prefetch(self, objs):
+        """Fetch remote details for the page, keyed by context entry."""
+        return {
+            'students_map': get_profile_client().get_students_details(
+                obj.student_id for obj in objs
+            )
+        }
+    
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        iterable = list(iterable)
+        try:
+            self.context.update(self.prefetch(iterable))
+        except Exception as e:
+            logger.warning("Error prefetching details: %s", e)
+        return super().to_representation(iterable)
+
+
+class SummaryBatchingListSerializer(StudentBatchingListSerializer):
+    """Prefetch students and offers for a page of summaries concurrently."""
+    
+    def prefetch(self, objs):
+        students = submit_many(
+            get_profile_client().get_student_details, (obj.student_id for obj in objs)
+        )
+        offers = submit_many(
+            get_core_client().get_offer_details, (obj.offer_id for obj in objs)
+        )
+        # A page usually covers one offer: build its summary once, not per row
+        return {
+            'students_map': gather(students),
+            'offer_summaries': {
+                offer_id: _offer_summary(offer) for offer_id, offer in gather(offers).items()
+            }
+        }
 
 
 class MarkAttendanceRequest(serializers.Serializer):
@@ -46,20 +121,17 @@ class AttendanceRecordWithDetailsSerializer(serializers.ModelSerializer):
             'student'
         ]
         read_only_fields = ['id', 'marked_at']
+        list_serializer_class = StudentBatchingListSerializer
     
     def get_student(self, obj):
-        """Fetch student details from PROFILE-SERVICE."""
+        """Fetch student details from PROFILE-SERVICE (prefetched for lists)."""
+        students_map = self.context.get('students_map')
+        if students_map is not None:
+            return _student_summary(students_map.get(str(obj.student_id)))
         try:
-            profile_client = get_profile_client()
-            student = profile_client.get_student_details(obj.student_id)
-            if student:
-                return {
-                    'first_name': student.get('first_name'),
-                    'last_name': student.get('last_name'),
-                    'student_number': student.get('student_number'),
-                }
+            return _student_summary(get_profile_client().get_student_details(obj.student_id))
         except Exception as e:
-            print(f"Error fetching student details: {e}")
+            logger.warning("Error fetching student details: %s", e)
         return None
 
 
@@ -109,32 +181,26 @@ class AttendanceSummaryWithDetailsSerializer(serializers.ModelSerializer):
             'student', 'offer'
         ]
         read_only_fields = ['id', 'presence_rate']
+        list_serializer_class = SummaryBatchingListSerializer
     
     def get_student(self, obj):
-        """Fetch student details from PROFILE-SERVICE."""
+        """Fetch student details from PROFILE-SERVICE (prefetched for lists)."""
+        students_map = self.context.get('students_map')
+        if students_map is not None:
+            return _student_summary(students_map.get(str(obj.student_id)))
         try:
-            profile_client = get_profile_client()
-            student = profile_client.get_student_details(obj.student_id)
-            if student:
-                return {
-                    'first_name': student.get('first_name'),
-                    'last_name': student.get('last_name'),
-                    'student_number': student.get('student_number'),
-                }
+            return _student_summary(get_profile_client().get_student_details(obj.student_id))
         except Exception as e:
-            print(f"Error fetching student details: {e}")
+            logger.warning("Error fetching student details: %s", e)
         return None
     
     def get_offer(self, obj):
-        """Fetch offer details from CORE-SERVICE via Consul."""
+        """Fetch offer details from CORE-SERVICE (prefetched for lists)."""
+        offer_summaries = self.context.get('offer_summaries')
+        if offer_summaries is not None:
+            return offer_summaries.get(str(obj.offer_id), _MISSING_OFFER)
         try:
-            # You can implement this when CORE-SERVICE is accessible
-            # For now, return None or basic info
-            return {
-                'title': None,
-                'period_start': None,
-                'period_end': None,
-            }
+            return _offer_summary(get_core_client().get_offer_details(obj.offer_id))
         except Exception as e:
-            print(f"Error fetching offer details: {e}")
+            logger.warning("Error fetching offer details: %s", e)
         return None
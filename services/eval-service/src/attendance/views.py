@@ -1,10 +1,20 @@
 """Views for attendance app."""
+import logging
+import os
+import uuid
+import jwt
+from decimal import Decimal, InvalidOperation
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import Sum, Q, Count
+from django.db import connection, transaction
+from django.db.models import Sum, Q, Count, OuterRef
 from .models import AttendanceRecord, AttendanceSummary
 from .serializers import (
     AttendanceRecordSerializer,
@@ -16,24 +26,107 @@ from .serializers import (
     AttendanceSummaryWithDetailsSerializer
 )
 from utils.event_publisher import get_attendance_publisher
+from utils.queries import SubqueryCount
+
+logger = logging.getLogger(__name__)
+
+# JWT settings are read once at import, not on every request
+_JWT_SECRET = os.environ.get('JWT_SECRET_KEY', 'your-secret-key')
+_JWT_ALGS = [os.environ.get('JWT_ALGORITHM', 'HS256')]
+
+
+# Shared filter/field lists; expressions are copied when a query uses them
+_PRESENT_Q = Q(is_present=True)
+_RECORD_UNIQUE_FIELDS = ['student_id', 'offer_id', 'date']
+_RECORD_UPDATE_FIELDS = ['is_present', 'justified', 'justification_reason', 'marked_by']
+_SUMMARY_UNIQUE_FIELDS = ['student_id', 'offer_id']
+_SUMMARY_UPDATE_FIELDS = ['total_days', 'present_days']
+
+
+# Query-param spellings read as True; anything else is False
+_TRUE_SET = frozenset({'true', 'True', 'TRUE', '1'})
+
+
+def _parse_bool(value):
+    """Parse a boolean query param (None when absent) without lower()-ing it."""
+    return None if value is None else value in _TRUE_SET
+
+
+def _summary_day_count(*conditions):
+    """COUNT of the outer summary's attendance records, as an SQL subquery."""
+    return SubqueryCount(
+        AttendanceRecord.objects.filter(
+            *conditions,
+            student_id=OuterRef('student_id'),
+            offer_id=OuterRef('offer_id')
+        ).values('id')
+    )
+
+
+# bulk_mark upserts larger than this skip model instances and go through raw SQL
+RAW_UPSERT_THRESHOLD = 500
+# Rows per raw INSERT statement (9 parameters each, well under PostgreSQL's 65535)
+RAW_UPSERT_BATCH_SIZE = 1000
+
+_RAW_UPSERT_COLUMNS = (
+    'id', 'student_id', 'offer_id', 'date', 'is_present',
+    'justified', 'justification_reason', 'marked_by', 'marked_at'
+)
+
+
+def _upsert_records_raw(offer_id, date, marked_by, records):
+    """INSERT ... ON CONFLICT DO UPDATE attendance rows without building models."""
+    now = timezone.now()
+    rows = [
+        (
+            uuid.uuid4(), record_data['student_id'], offer_id, date,
+            record_data['is_present'], record_data.get('justified', False),
+            record_data.get('justification_reason'), marked_by, now
+        )
+        for record_data in records
+    ]
+    qn = connection.ops.quote_name
+    sql_prefix = 'INSERT INTO {} ({}) VALUES '.format(
+        qn(AttendanceRecord._meta.db_table),
+        ', '.join(qn(column) for column in _RAW_UPSERT_COLUMNS)
+    )
+    sql_suffix = ' ON CONFLICT ({}) DO UPDATE SET {}'.format(
+        ', '.join(qn(column) for column in _RECORD_UNIQUE_FIELDS),
+        ', '.join(f'{qn(column)} = EXCLUDED.{qn(column)}' for column in _RECORD_UPDATE_FIELDS)
+    )
+    placeholder = '({})'.format(', '.join(['%s'] * len(_RAW_UPSERT_COLUMNS)))
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), RAW_UPSERT_BATCH_SIZE):
+            batch = rows[start:start + RAW_UPSERT_BATCH_SIZE]
+            cursor.execute(
+                sql_prefix + ', '.join([placeholder] * len(batch)) + sql_suffix,
+                [value for row in batch for value in row]
+            )
+
+
+# UPDATE values recounting a summary from its records
+_SUMMARY_RECOUNT = {
+    'total_days': _summary_day_count(),
+    'present_days': _summary_day_count(_PRESENT_Q),
+}
 
 
 def get_user_id_from_request(request):
-    """Extract user ID from JWT token."""
-    import jwt
-    import os
+    """Extract user ID from JWT token (decoded once per request)."""
+    if hasattr(request, '_cached_jwt_user_id'):
+        return request._cached_jwt_user_id
     
+    user_id = None
     auth_header = request.META.get('HTTP_AUTHORIZATION', '')
     if auth_header.startswith('Bearer '):
         token = auth_header.split(' ')[1]
         try:
-            secret_key = os.environ.get('JWT_SECRET_KEY', 'your-secret-key')
-            algorithm = os.environ.get('JWT_ALGORITHM', 'HS256')
-            payload = jwt.decode(token, secret_key, algorithms=[algorithm])
-            return payload.get('user_id') or payload.get('sub')
+            payload = jwt.decode(token, _JWT_SECRET, algorithms=_JWT_ALGS)
+            user_id = payload.get('user_id') or payload.get('sub')
         except Exception as e:
-            print(f"Error decoding JWT: {e}")
-    return None
+            logger.warning("Error decoding JWT: %s", e)
+    request._cached_jwt_user_id = user_id
+    return user_id
 
 
 class AttendanceViewSet(viewsets.ModelViewSet):
@@ -41,9 +134,12 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     queryset = AttendanceRecord.objects.all()
     serializer_class = AttendanceRecordSerializer
     
+    # Actions rendered with the detailed (remote lookups) serializer
+    _detail_actions = frozenset({'list', 'retrieve'})
+    
     def get_serializer_class(self):
         """Use detailed serializer for list/retrieve."""
-        if self.action in ['list', 'retrieve']:
+        if self.action in self._detail_actions:
             return AttendanceRecordWithDetailsSerializer
         return AttendanceRecordSerializer
     
@@ -78,11 +174,11 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         # Boolean filters
         is_present = self.request.query_params.get('is_present')
         if is_present is not None:
-            queryset = queryset.filter(is_present=is_present.lower() == 'true')
+            queryset = queryset.filter(is_present=_parse_bool(is_present))
         
         justified = self.request.query_params.get('justified')
         if justified is not None:
-            queryset = queryset.filter(justified=justified.lower() == 'true')
+            queryset = queryset.filter(justified=_parse_bool(justified))
         
         return queryset.order_by('-date', 'student_id')
     
@@ -141,14 +237,18 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     
     def update(self, request, pk=None):
         """Update attendance record."""
-        attendance = self.get_object()
         serializer = UpdateAttendanceRequest(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Update fields
-        for field, value in serializer.validated_data.items():
-            setattr(attendance, field, value)
-        attendance.save()
+        # One UPDATE of just the submitted columns, then read the row back;
+        # a malformed pk is a 404, as with get_object()
+        try:
+            records = self.get_queryset().filter(pk=pk)
+            if serializer.validated_data:
+                records.update(**serializer.validated_data)
+            attendance = get_object_or_404(records)
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
         
         # Update summary
         self._update_attendance_summary(attendance.student_id, attendance.offer_id)
@@ -158,7 +258,13 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     
     def destroy(self, request, pk=None):
         """Delete attendance record."""
-        attendance = self.get_object()
+        # Only the ids needed for the summary recount are read
+        try:
+            attendance = get_object_or_404(
+                self.get_queryset().only('id', 'student_id', 'offer_id'), pk=pk
+            )
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
         student_id = attendance.student_id
         offer_id = attendance.offer_id
         
@@ -180,23 +286,43 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         date = serializer.validated_data['date']
         records = serializer.validated_data['records']
         
-        created_records = []
-        for record_data in records:
-            attendance, _ = AttendanceRecord.objects.update_or_create(
-                student_id=record_data['student_id'],
-                offer_id=offer_id,
-                date=date,
-                defaults={
-                    'is_present': record_data['is_present'],
-                    'justified': record_data.get('justified', False),
-                    'justification_reason': record_data.get('justification_reason'),
-                    'marked_by': user_id,
-                }
-            )
-            created_records.append(attendance)
-            
-            # Update summary for each student
-            self._update_attendance_summary(record_data['student_id'], offer_id)
+        # One row per student; a repeated student_id keeps its last entry
+        by_student = {record_data['student_id']: record_data for record_data in records}
+        student_ids = list(by_student)
+        
+        with transaction.atomic():
+            # INSERT ... ON CONFLICT DO UPDATE for the whole day
+            if len(by_student) > RAW_UPSERT_THRESHOLD:
+                _upsert_records_raw(offer_id, date, user_id, by_student.values())
+            else:
+                AttendanceRecord.objects.bulk_create(
+                    [
+                        AttendanceRecord(
+                            student_id=student_id,
+                            offer_id=offer_id,
+                            date=date,
+                            is_present=record_data['is_present'],
+                            justified=record_data.get('justified', False),
+                            justification_reason=record_data.get('justification_reason'),
+                            marked_by=user_id,
+                        )
+                        for student_id, record_data in by_student.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=_RECORD_UNIQUE_FIELDS,
+                    update_fields=_RECORD_UPDATE_FIELDS
+                )
+            summaries = self._update_attendance_summaries(student_ids, offer_id)
+        
+        # Re-read so updated rows report their stored id and marked_at
+        created_records = list(
+            AttendanceRecord.objects.filter(
+                offer_id=offer_id, date=date, student_id__in=student_ids
+            ).order_by('student_id')
+        )
+        
+        for summary in summaries:
+            self._publish_summary_updated(summary)
         
         # Publish bulk attendance event
         publisher = get_attendance_publisher()
@@ -212,41 +338,67 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     
     def _update_attendance_summary(self, student_id, offer_id):
         """Update or create attendance summary for a student."""
-        # Get all attendance records for this student/offer
-        records = AttendanceRecord.objects.filter(
+        summaries = AttendanceSummary.objects.filter(
             student_id=student_id,
             offer_id=offer_id
         )
+        # Recount inside the UPDATE itself, so concurrent marks cannot
+        # interleave between the count and the write; PostgreSQL then
+        # regenerates presence_rate in the same statement
+        if not summaries.update(**_SUMMARY_RECOUNT):
+            AttendanceSummary.objects.bulk_create(
+                [AttendanceSummary(student_id=student_id, offer_id=offer_id)],
+                ignore_conflicts=True
+            )
+            summaries.update(**_SUMMARY_RECOUNT)
         
-        total_days = records.count()
-        present_days = records.filter(is_present=True).count()
-        
-        # Calculate presence rate
-        presence_rate = (present_days / total_days * 100) if total_days > 0 else 0
+        summary = summaries.get()
+        self._publish_summary_updated(summary)
         
-        # Update or create summary
-        summary, _ = AttendanceSummary.objects.update_or_create(
-            student_id=student_id,
+        return summary
+    
+    def _update_attendance_summaries(self, student_ids, offer_id):
+        """Recompute the summaries of several students with one GROUP BY and one upsert."""
+        counts = AttendanceRecord.objects.filter(
             offer_id=offer_id,
-            defaults={
-                'total_days': total_days,
-                'present_days': present_days,
-                'presence_rate': round(presence_rate, 2),
-            }
+            student_id__in=student_ids
+        ).values('student_id').annotate(
+            total=Count('id'),
+            present=Count('id', filter=_PRESENT_Q)
         )
-        
-        # Publish summary updated event
+        summaries = [
+            AttendanceSummary(
+                student_id=row['student_id'],
+                offer_id=offer_id,
+                total_days=row['total'],
+                present_days=row['present']
+            )
+            for row in counts
+        ]
+        AttendanceSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=_SUMMARY_UNIQUE_FIELDS,
+            update_fields=_SUMMARY_UPDATE_FIELDS
+        )
+        # Rows that already existed keep their id, not the new instance's
+        # default uuid, so read the stored summaries back
+        return list(AttendanceSummary.objects.filter(
+            offer_id=offer_id,
+            student_id__in=student_ids
+        ))
+    
+    def _publish_summary_updated(self, summary):
+        """Publish attendance.summary.updated for a summary read back from the DB."""
         publisher = get_attendance_publisher()
         publisher.publish_attendance_summary_updated({
             'summary_id': str(summary.id),
-            'student_id': str(student_id),
-            'offer_id': str(offer_id),
-            'total_days': total_days,
-            'present_days': present_days,
-            'presence_rate': round(presence_rate, 2)
+            'student_id': str(summary.student_id),
+            'offer_id': str(summary.offer_id),
+            'total_days': summary.total_days,
+            'present_days': summary.present_days,
+            'presence_rate': float(summary.presence_rate)
         })
-        
-        return summary
 
 
 class AttendanceSummaryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -254,9 +406,12 @@ class AttendanceSummaryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AttendanceSummary.objects.all()
     serializer_class = AttendanceSummarySerializer
     
+    # Actions rendered with the detailed (remote lookups) serializer
+    _detail_actions = frozenset({'list', 'retrieve'})
+    
     def get_serializer_class(self):
         """Use detailed serializer for list/retrieve."""
-        if self.action in ['list', 'retrieve']:
+        if self.action in self._detail_actions:
             return AttendanceSummaryWithDetailsSerializer
         return AttendanceSummarySerializer
     
@@ -275,11 +430,18 @@ class AttendanceSummaryViewSet(viewsets.ReadOnlyModelViewSet):
         
         validated = self.request.query_params.get('validated')
         if validated is not None:
-            queryset = queryset.filter(validated=validated.lower() == 'true')
+            queryset = queryset.filter(validated=_parse_bool(validated))
         
         min_presence_rate = self.request.query_params.get('min_presence_rate')
         if min_presence_rate:
-            queryset = queryset.filter(presence_rate__gte=float(min_presence_rate))
+            # Decimal, like the column: no float cast, no rounding near 80
+            try:
+                min_rate = Decimal(min_presence_rate)
+            except InvalidOperation:
+                min_rate = None
+            if min_rate is None or not min_rate.is_finite():
+                raise ValidationError({'min_presence_rate': 'Must be a number.'})
+            queryset = queryset.filter(presence_rate__gte=min_rate)
         
         return queryset.order_by('-presence_rate')
     
@@ -1,23 +1,33 @@
 """Health check and metrics endpoints for eval_service."""
+import time
 from datetime import datetime, timezone
-from django.http import JsonResponse, HttpResponse
+from functools import lru_cache
+import orjson
+from django.http import HttpResponse
 from django.conf import settings
 
-def health_check(_request):
-    return JsonResponse({
+@lru_cache(maxsize=1)
+def _health_body(second):
+    """Serialized health payload, rebuilt at most once per second."""
+    return orjson.dumps({
         'status': 'ok',
         'service': settings.SERVICE_NAME,
-        'time': datetime.now(timezone.utc).isoformat()
+        'time': datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
     })
 
+def health_check(_request):
+    return HttpResponse(_health_body(int(time.time())), content_type='application/json')
+
+# The metrics never change while the process runs; render them once
+_METRICS_PAYLOAD = '\n'.join([
+    '# HELP service_info Service information',
+    '# TYPE service_info gauge',
+    f'service_info{{service="{settings.SERVICE_NAME}"}} 1',
+    '# HELP service_health Service health status (1 = healthy)',
+    '# TYPE service_health gauge',
+    f'service_health{{service="{settings.SERVICE_NAME}"}} 1',
+]).encode('utf-8')
+
 def metrics_view(_request):
-    metrics = [
-        '# HELP service_info Service information',
-        '# TYPE service_info gauge',
-        f'service_info{{service="{settings.SERVICE_NAME}"}} 1',
-        '# HELP service_health Service health status (1 = healthy)',
-        '# TYPE service_health gauge',
-        f'service_health{{service="{settings.SERVICE_NAME}"}} 1',
-    ]
-    return HttpResponse('\n'.join(metrics), content_type='text/plain')
+    return HttpResponse(_METRICS_PAYLOAD, content_type='text/plain; version=0.0.4')
 
@@ -0,0 +1,24 @@
+"""Logging handlers for eval_service."""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueuedStreamHandler(QueueHandler):
+    """
+    Console handler shared by the API workers and the consumer.py threads.
+    
+    Report views and the RabbitMQ consumer threads log on their hot paths
+    (remote lookup failures, batch inserts); here they only put the record on
+    a queue, and a single listener thread writes it to stderr. A stalled log
+    pipe therefore delays neither a response nor a message ack.
+    """
+    
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(queue.SimpleQueue())
+        self.setLevel(level)
+        self.listener = QueueListener(self.queue, logging.StreamHandler())
+        self.listener.start()
+        # Flush what is still queued when a worker or the consumer exits
+        atexit.register(self.listener.stop)
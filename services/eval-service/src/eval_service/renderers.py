@@ -0,0 +1,47 @@
+"""Response renderers for eval_service."""
+import datetime
+import decimal
+
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    """Encode the types orjson lacks the same way DRF's JSONEncoder does."""
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, QuerySet):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class OrjsonRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+    
+    Encodes in C and returns bytes directly; UUIDs, datetimes and dataclasses
+    are handled natively, everything else falls back to _default.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
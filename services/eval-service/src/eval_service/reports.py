@@ -1,13 +1,95 @@
 """Views for statistics and reports."""
+import hashlib
+import logging
+import orjson
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count, Q, Avg
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import Count, Q, Avg, Sum, F, FloatField, OuterRef
+from django.db.models.functions import Cast, JSONObject, NullIf
 from datetime import datetime
+from itertools import islice
 from attendance.models import AttendanceRecord, AttendanceSummary
 from evaluations.models import Evaluation, EvaluationSection
 from utils.service_client import get_profile_client, get_core_client
 
+logger = logging.getLogger(__name__)
+
+# Seconds a built report is served from cache, and how long the last good
+# copy is kept to answer with when rebuilding it fails
+REPORT_CACHE_TTL = 30
+REPORT_BACKUP_TTL = 600
+
+# Evaluations read (and offers looked up) per round trip when streaming a report
+STREAM_CHUNK_SIZE = 200
+
+
+# Report summary aggregates; zero (unset) grades stay out of the average
+EVALUATION_STATS = {
+    'total': Count('id'),
+    'validated': Count('id', filter=Q(validated=True)),
+    'average_grade': Avg('grade', filter=Q(grade__gt=0)),
+}
+
+
+def _cached_report(key, build):
+    """
+    Return the report cached under key, calling build() when it is missing.
+    
+    If build() raises, the last good copy is served instead (stale-while-error).
+    """
+    report = cache.get(key)
+    if report is not None:
+        return report
+    try:
+        report = build()
+    except Exception as e:
+        report = cache.get(f"{key}:backup")
+        if report is None:
+            raise
+        logger.warning("Serving stale %s after error: %s", key, e)
+        return report
+    cache.set(key, report, REPORT_CACHE_TTL)
+    cache.set(f"{key}:backup", report, REPORT_BACKUP_TTL)
+    return report
+
+
+def _report_etag(report):
+    """
+    Quoted ETag for a report's content, ignoring its generated_at stamp.
+    
+    A rebuilt report with unchanged data keeps the same ETag, so polling
+    clients keep getting 304s across cache refreshes.
+    """
+    content = {key: value for key, value in report.items() if key != 'generated_at'}
+    return quote_etag(hashlib.blake2b(orjson.dumps(content), digest_size=16).hexdigest())
+
+
+class ReportPagination(PageNumberPagination):
+    """Pagination for the per-student and per-evaluation lists in reports."""
+    page_size = 50
+    page_size_query_param = 'per_page'
+    max_page_size = 200
+
+
+def _page_params(request):
+    """Return (page, per_page) from ?page=&per_page=; 404 on an invalid page."""
+    paginator = ReportPagination()
+    per_page = paginator.get_page_size(request)
+    try:
+        page = int(request.query_params.get(paginator.page_query_param, 1))
+    except (TypeError, ValueError):
+        raise NotFound('Invalid page.')
+    if page < 1:
+        raise NotFound('Invalid page.')
+    return page, per_page
+
 
 class AttendanceStatisticsView(APIView):
     """Get attendance statistics for an offer."""
@@ -25,6 +107,15 @@ class AttendanceStatisticsView(APIView):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
+        page, per_page = _page_params(request)
+        
+        return Response(_cached_report(
+            f"att:stats:{offer_id}:{start_date}:{end_date}:{page}:{per_page}",
+            lambda: self.build_statistics(offer_id, start_date, end_date, page, per_page)
+        ))
+    
+    def build_statistics(self, offer_id, start_date, end_date, page=1, per_page=ReportPagination.page_size):
+        """Compute the statistics payload for an offer and date range."""
         # Base queryset
         queryset = AttendanceRecord.objects.filter(offer_id=offer_id)
         
@@ -33,41 +124,57 @@ class AttendanceStatisticsView(APIView):
         if end_date:
             queryset = queryset.filter(date__lte=end_date)
         
-        # Overall statistics
-        total_records = queryset.count()
-        present_records = queryset.filter(is_present=True).count()
+        # Overall statistics, counted in one pass
+        totals = queryset.aggregate(
+            total=Count('id'),
+            present=Count('id', filter=Q(is_present=True)),
+            justified=Count('id', filter=Q(is_present=False, justified=True))
+        )
+        total_records = totals['total']
+        present_records = totals['present']
         absence_records = total_records - present_records
-        justified_absences = queryset.filter(is_present=False, justified=True).count()
+        justified_absences = totals['justified']
         
         # Calculate presence rate
         presence_rate = (present_records / total_records * 100) if total_records > 0 else 0
         
-        # Group by student
+        # Group by student, highest presence rate first (sorted by Postgres)
         student_stats = {}
         student_records = queryset.values('student_id').annotate(
             total=Count('id'),
             present=Count('id', filter=Q(is_present=True))
-        )
+        ).annotate(
+            presence_rate=Cast(F('present'), FloatField()) * 100.0
+            / NullIf(Cast(F('total'), FloatField()), 0.0)
+        ).order_by('-presence_rate', 'student_id')
         
+        # Only one page of students is read (LIMIT/OFFSET) and looked up
+        student_count = student_records.count()
+        offset = (page - 1) * per_page
         by_student = []
-        profile_client = get_profile_client()
+        student_records = list(student_records[offset:offset + per_page])
+        
+        # Fetch every student name at once instead of one call per row
+        students = {}
+        try:
+            students = get_profile_client().get_students_details(
+                record['student_id'] for record in student_records
+            )
+        except Exception as e:
+            logger.warning("Error fetching students: %s", e)
         
         for student_record in student_records:
             student_id = str(student_record['student_id'])
             total = student_record['total']
             present = student_record['present']
-            student_presence_rate = (present / total * 100) if total > 0 else 0
+            student_presence_rate = student_record['presence_rate'] or 0
             
-            # Fetch student name
             student_name = 'Unknown'
-            try:
-                student = profile_client.get_student_details(student_id)
-                if student:
-                    first_name = student.get('first_name', '')
-                    last_name = student.get('last_name', '')
-                    student_name = f"{first_name} {last_name}".strip() or student.get('student_number', 'Unknown')
-            except Exception as e:
-                print(f"Error fetching student {student_id}: {e}")
+            student = students.get(student_id)
+            if student:
+                first_name = student.get('first_name', '')
+                last_name = student.get('last_name', '')
+                student_name = f"{first_name} {last_name}".strip() or student.get('student_number', 'Unknown')
             
             by_student.append({
                 'student_id': student_id,
@@ -77,17 +184,66 @@ class AttendanceStatisticsView(APIView):
                 'present_days': present,
             })
         
-        # Sort by presence rate descending
-        by_student.sort(key=lambda x: x['presence_rate'], reverse=True)
-        
-        return Response({
+        return {
             'total_days': total_records,
             'present_days': present_records,
             'absence_days': absence_records,
             'justified_absences': justified_absences,
             'presence_rate': round(presence_rate, 2),
             'by_student': by_student,
-        })
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'count': student_count,
+            },
+        }
+
+
+def _evaluation_rows(evaluations_qs):
+    """
+    Evaluations (newest first) as dicts, each with its sections nested by
+    Postgres as a JSON array, so rows and sections come back in one query
+    without model instances. Grades and scores arrive as floats, not Decimals.
+    """
+    return evaluations_qs.order_by('-submitted_at', 'id').values(
+        'id', 'offer_id', 'comments', 'submitted_at', 'validated',
+        grade_value=Cast('grade', FloatField()),
+        section_list=ArraySubquery(
+            EvaluationSection.objects.filter(evaluation=OuterRef('pk')).order_by('id').values(
+                json=JSONObject(criterion='criterion', score='score', comments='comments')
+            )
+        ),
+    )
+
+
+def _fetch_offers(evaluations):
+    """Fetch each distinct offer of the given rows once, concurrently."""
+    try:
+        return get_core_client().get_offers_details(
+            evaluation['offer_id'] for evaluation in evaluations
+        )
+    except Exception as e:
+        logger.warning("Error fetching offers: %s", e)
+        return {}
+
+
+def _format_evaluation(evaluation, offers):
+    """Render one evaluation row for the report."""
+    offer = offers.get(str(evaluation['offer_id']))
+    return {
+        'id': evaluation['id'],
+        'offer_id': evaluation['offer_id'],
+        'offer_title': offer.get('title') if offer else None,
+        'grade': evaluation['grade_value'] or None,
+        'comments': evaluation['comments'],
+        'submitted_at': evaluation['submitted_at'],
+        'validated': evaluation['validated'],
+        'sections': [{
+            'criterion': section['criterion'],
+            'score': section['score'] or None,
+            'comments': section['comments'],
+        } for section in evaluation['section_list']],
+    }
 
 
 class EvaluationReportView(APIView):
@@ -98,6 +254,80 @@ class EvaluationReportView(APIView):
         offer_id = request.query_params.get('offer_id')
         report_format = request.query_params.get('format', 'json')
         
+        # ?stream=1 writes every evaluation as it is read instead of one page
+        if report_format == 'json' and request.query_params.get('stream') == '1':
+            return StreamingHttpResponse(
+                self.stream_report(student_id, offer_id),
+                content_type='application/json'
+            )
+        
+        page, per_page = _page_params(request)
+        
+        report = _cached_report(
+            f"eval:report:{student_id}:{offer_id}:{page}:{per_page}",
+            lambda: self.build_report(student_id, offer_id, page, per_page)
+        )
+        
+        if report_format == 'json':
+            # Conditional GET: nothing changed since the client's copy
+            etag = _report_etag(report)
+            if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            return Response(report, headers={'ETag': etag})
+        elif report_format == 'pdf':
+            # For now, return JSON with a note (PDF generation would require additional libraries)
+            return Response({
+                'message': 'PDF generation not yet implemented',
+                'data': report
+            }, status=status.HTTP_501_NOT_IMPLEMENTED)
+        else:
+            return Response(
+                {'error': 'Invalid format. Use json or pdf'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    def build_report(self, student_id, offer_id, page=1, per_page=ReportPagination.page_size):
+        """Assemble the evaluation report for a student (optionally one offer)."""
+        evaluations_qs, report = self.build_summary(student_id, offer_id)
+        
+        # One page of evaluations; the summary still covers them all
+        offset = (page - 1) * per_page
+        evaluations = list(_evaluation_rows(evaluations_qs)[offset:offset + per_page])
+        offers = _fetch_offers(evaluations)
+        
+        report['evaluations'] = [_format_evaluation(evaluation, offers) for evaluation in evaluations]
+        report['pagination'] = {
+            'page': page,
+            'per_page': per_page,
+            'count': report['summary']['total_evaluations'],
+        }
+        return report
+    
+    def stream_report(self, student_id, offer_id):
+        """Yield the full report as JSON bytes, STREAM_CHUNK_SIZE evaluations at a time."""
+        evaluations_qs, report = self.build_summary(student_id, offer_id)
+        
+        # Reopen the summary object to append the evaluations array
+        yield orjson.dumps(report)[:-1] + b',"evaluations":['
+        
+        rows = _evaluation_rows(evaluations_qs).iterator(chunk_size=STREAM_CHUNK_SIZE)
+        separator = b''
+        while True:
+            chunk = list(islice(rows, STREAM_CHUNK_SIZE))
+            if not chunk:
+                break
+            offers = _fetch_offers(chunk)
+            for evaluation in chunk:
+                yield separator + orjson.dumps(_format_evaluation(evaluation, offers))
+                separator = b','
+        yield b']}'
+    
+    def build_summary(self, student_id, offer_id):
+        """
+        Return (evaluations queryset, report without its evaluations).
+        
+        The report holds the student, attendance and overall statistics.
+        """
         # Base queryset
         evaluations_qs = Evaluation.objects.filter(student_id=student_id)
         if offer_id:
@@ -116,92 +346,47 @@ class EvaluationReportView(APIView):
                     'student_number': student.get('student_number'),
                 }
         except Exception as e:
-            print(f"Error fetching student: {e}")
+            logger.warning("Error fetching student: %s", e)
         
         # Get attendance summary
         attendance_summaries = AttendanceSummary.objects.filter(student_id=student_id)
         if offer_id:
             attendance_summaries = attendance_summaries.filter(offer_id=offer_id)
         
+        # Plain dicts; no model instances are built for the report rows.
+        # UUIDs and datetimes are left as-is for orjson to encode natively.
         attendance_data = []
-        for summary in attendance_summaries:
-            attendance_data.append({
-                'offer_id': str(summary.offer_id),
-                'total_days': summary.total_days,
-                'present_days': summary.present_days,
-                'presence_rate': float(summary.presence_rate),
-                'validated': summary.validated,
-            })
-        
-        # Get evaluations
-        evaluations_data = []
-        core_client = get_core_client()
-        
-        for evaluation in evaluations_qs:
-            # Get offer details
-            offer_title = None
-            try:
-                offer = core_client.get_offer_details(str(evaluation.offer_id))
-                if offer:
-                    offer_title = offer.get('title')
-            except Exception as e:
-                print(f"Error fetching offer: {e}")
-            
-            # Get sections
-            sections = EvaluationSection.objects.filter(evaluation=evaluation)
-            sections_data = [{
-                'criterion': section.criterion,
-                'score': float(section.score) if section.score else None,
-                'comments': section.comments,
-            } for section in sections]
-            
-            evaluations_data.append({
-                'id': str(evaluation.id),
-                'offer_id': str(evaluation.offer_id),
-                'offer_title': offer_title,
-                'grade': float(evaluation.grade) if evaluation.grade else None,
-                'comments': evaluation.comments,
-                'submitted_at': evaluation.submitted_at.isoformat(),
-                'validated': evaluation.validated,
-                'sections': sections_data,
-            })
-        
-        # Calculate overall statistics
-        total_evaluations = len(evaluations_data)
-        validated_evaluations = len([e for e in evaluations_data if e['validated']])
+        for summary in attendance_summaries.values(
+            'offer_id', 'total_days', 'present_days', 'presence_rate', 'validated'
+        ):
+            summary['presence_rate'] = float(summary['presence_rate'])
+            attendance_data.append(summary)
         
-        grades = [e['grade'] for e in evaluations_data if e['grade'] is not None]
-        average_grade = sum(grades) / len(grades) if grades else None
+        # Calculate overall statistics; reductions run in Postgres and come back as scalars
+        stats = evaluations_qs.aggregate(**EVALUATION_STATS)
+        average_grade = stats['average_grade']
+        if average_grade is not None:
+            average_grade = float(average_grade)
         
         overall_attendance_rate = None
-        if attendance_data:
-            total_days = sum(a['total_days'] for a in attendance_data)
-            total_present = sum(a['present_days'] for a in attendance_data)
-            overall_attendance_rate = (total_present / total_days * 100) if total_days > 0 else 0
+        totals = attendance_summaries.aggregate(
+            total_days=Sum('total_days'),
+            total_present=Sum('present_days'),
+        )
+        total_days = totals['total_days']
+        if total_days is not None:
+            overall_attendance_rate = (totals['total_present'] / total_days * 100) if total_days > 0 else 0
         
         report = {
             'student': student_info,
             'summary': {
-                'total_evaluations': total_evaluations,
-                'validated_evaluations': validated_evaluations,
+                'total_evaluations': stats['total'],
+                'validated_evaluations': stats['validated'],
                 'average_grade': round(average_grade, 2) if average_grade else None,
                 'overall_attendance_rate': round(overall_attendance_rate, 2) if overall_attendance_rate else None,
             },
             'attendance': attendance_data,
-            'evaluations': evaluations_data,
             'generated_at': datetime.now().isoformat(),
         }
         
-        if report_format == 'json':
-            return Response(report)
-        elif report_format == 'pdf':
-            # For now, return JSON with a note (PDF generation would require additional libraries)
-            return Response({
-                'message': 'PDF generation not yet implemented',
-                'data': report
-            }, status=status.HTTP_501_NOT_IMPLEMENTED)
-        else:
-            return Response(
-                {'error': 'Invalid format. Use json or pdf'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        return evaluations_qs, report
@@ -29,8 +29,13 @@ class Evaluation(models.Model):
         db_table = 'evaluations'
         ordering = ['-submitted_at']
         indexes = [
-            models.Index(fields=['student_id']),
-            models.Index(fields=['offer_id']),
+            # Report: a student's evaluations (optionally one offer), newest first.
+            # Also serves plain student_id lookups (leftmost column).
+            models.Index(fields=['student_id', 'offer_id', '-submitted_at'], name='eval_student_offer_submitted'),
+            # Offer filters, with or without validated; also serves plain offer_id lookups
+            models.Index(fields=['offer_id', 'validated'], name='eval_offer_validated'),
+            # Keyset pagination of the list endpoint
+            models.Index(fields=['-submitted_at', '-id'], name='eval_submitted_id_desc'),
         ]
     
     def __str__(self):
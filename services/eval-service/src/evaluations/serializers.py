@@ -1,8 +1,90 @@
 """Serializers for evaluations app."""
+import logging
 from rest_framework import serializers
 from django.utils import timezone
 from .models import Evaluation, EvaluationSection
-from utils.service_client import get_profile_client, get_auth_client, get_core_client
+from django.db import models
+from utils.service_client import get_profile_client, get_auth_client, get_core_client, gather, submit_many
+
+logger = logging.getLogger(__name__)
+
+
+def _student_summary(student):
+    """Keep only the student fields exposed by evaluation payloads."""
+    if not student:
+        return None
+    return {
+        'first_name': student.get('first_name'),
+        'last_name': student.get('last_name'),
+        'student_number': student.get('student_number'),
+    }
+
+
+def _offer_summary(offer):
+    """Keep only the offer fields exposed by evaluation payloads."""
+    if not offer:
+        return {
+            'title': None,
+            'service_name': None,
+            'establishment_name': None,
+        }
+    return {
+        'title': offer.get('title'),
+        'service_name': offer.get('service', {}).get('name') if offer.get('service') else None,
+        'establishment_name': offer.get('establishment', {}).get('name') if offer.get('establishment') else None,
+    }
+
+
+def _evaluator_summary(evaluator):
+    """Keep only the evaluator fields exposed by evaluation payloads."""
+    if not evaluator:
+        return None
+    return {
+        'first_name': evaluator.get('first_name'),
+        'last_name': evaluator.get('last_name'),
+    }
+
+
+def _prefetch_details(context, evaluations):
+    """
+    Fetch the students, offers and evaluators of evaluations into context.
+    
+    The three services are queried concurrently, each distinct id once, so
+    the wall time is that of the slowest lookup rather than their sum.
+    """
+    try:
+        students = submit_many(
+            get_profile_client().get_student_details, (obj.student_id for obj in evaluations)
+        )
+        offers = submit_many(
+            get_core_client().get_offer_details, (obj.offer_id for obj in evaluations)
+        )
+        evaluators = submit_many(
+            get_auth_client().get_user_details,
+            (obj.evaluator_id for obj in evaluations if obj.evaluator_id)
+        )
+        context.update({
+            'students_map': gather(students),
+            'offers_map': gather(offers),
+            'evaluators_map': gather(evaluators),
+        })
+    except Exception as e:
+        logger.warning("Error prefetching details: %s", e)
+
+
+class EvaluationListSerializer(serializers.ListSerializer):
+    """
+    List serializer that fetches a page's students, offers and evaluators up front.
+    
+    The three lookups run concurrently, each distinct id once, and are stored
+    in the context so the child's get_* methods make no remote calls.
+    """
+    
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        iterable = list(iterable)
+        _prefetch_details(self.context, iterable)
+        return super().to_representation(iterable)
 
 
 class EvaluationSectionSerializer(serializers.ModelSerializer):
@@ -70,64 +152,59 @@ class EvaluationWithDetailsSerializer(serializers.ModelSerializer):
             'student', 'offer', 'evaluator', 'sections'
         ]
         read_only_fields = ['id', 'submitted_at']
+        list_serializer_class = EvaluationListSerializer
+    
+    def to_representation(self, instance):
+        # A single evaluation (retrieve) overlaps its three lookups too;
+        # list children already find the page's maps in the shared context
+        if self.parent is None and 'students_map' not in self.context:
+            _prefetch_details(self.context, [instance])
+        return super().to_representation(instance)
     
     def get_student(self, obj):
-        """Fetch student details from PROFILE-SERVICE."""
+        """Fetch student details from PROFILE-SERVICE (prefetched for lists)."""
+        students_map = self.context.get('students_map')
+        if students_map is not None:
+            return _student_summary(students_map.get(str(obj.student_id)))
         try:
-            profile_client = get_profile_client()
-            student = profile_client.get_student_details(obj.student_id)
-            if student:
-                return {
-                    'first_name': student.get('first_name'),
-                    'last_name': student.get('last_name'),
-                    'student_number': student.get('student_number'),
-                }
+            return _student_summary(get_profile_client().get_student_details(obj.student_id))
         except Exception as e:
-            print(f"Error fetching student details: {e}")
+            logger.warning("Error fetching student details: %s", e)
         return None
     
     def get_offer(self, obj):
-        """Fetch offer details from CORE-SERVICE."""
+        """Fetch offer details from CORE-SERVICE (prefetched for lists)."""
+        offers_map = self.context.get('offers_map')
+        if offers_map is not None:
+            return _offer_summary(offers_map.get(str(obj.offer_id)))
         try:
-            core_client = get_core_client()
-            offer = core_client.get_offer_details(obj.offer_id)
-            if offer:
-                return {
-                    'title': offer.get('title'),
-                    'service_name': offer.get('service', {}).get('name') if offer.get('service') else None,
-                    'establishment_name': offer.get('establishment', {}).get('name') if offer.get('establishment') else None,
-                }
+            return _offer_summary(get_core_client().get_offer_details(obj.offer_id))
         except Exception as e:
-            print(f"Error fetching offer details: {e}")
-        return {
-            'title': None,
-            'service_name': None,
-            'establishment_name': None,
-        }
+            logger.warning("Error fetching offer details: %s", e)
+        return _offer_summary(None)
     
     def get_evaluator(self, obj):
-        """Fetch evaluator details from AUTH-SERVICE."""
+        """Fetch evaluator details from AUTH-SERVICE (prefetched for lists)."""
+        evaluators_map = self.context.get('evaluators_map')
+        if evaluators_map is not None:
+            return _evaluator_summary(evaluators_map.get(str(obj.evaluator_id)))
         try:
-            auth_client = get_auth_client()
-            evaluator = auth_client.get_user_details(obj.evaluator_id)
-            if evaluator:
-                return {
-                    'first_name': evaluator.get('first_name'),
-                    'last_name': evaluator.get('last_name'),
-                }
+            return _evaluator_summary(get_auth_client().get_user_details(obj.evaluator_id))
         except Exception as e:
-            print(f"Error fetching evaluator details: {e}")
+            logger.warning("Error fetching evaluator details: %s", e)
         return None
     
     def get_sections(self, obj):
-        """Get evaluation sections."""
-        sections = EvaluationSection.objects.filter(evaluation=obj).order_by('id')
+        """Get evaluation sections (prefetched, ordered by id, by the viewset)."""
+        if 'sections' in getattr(obj, '_prefetched_objects_cache', {}):
+            sections = obj.sections.all()
+        else:
+            sections = obj.sections.order_by('id')
         return EvaluationSectionSerializer(sections, many=True).data
 
 
 class PaginatedEvaluations(serializers.Serializer):
-    """Paginated response for evaluations."""
-    count = serializers.IntegerField()
+    """Cursor-paginated response for evaluations."""
     next = serializers.URLField(allow_null=True)
     previous = serializers.URLField(allow_null=True)
     results = EvaluationWithDetailsSerializer(many=True)
@@ -7,7 +7,12 @@ from decimal import Decimal
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from eval_service.reports import EVALUATION_STATS
 from evaluations.models import Evaluation, EvaluationSection
+from evaluations.serializers import EvaluationWithDetailsSerializer
+from evaluations.views import EvaluationViewSet
 
 
 class EvaluationModelTest(TestCase):
@@ -234,3 +239,58 @@ class EvaluationSectionModelTest(TestCase):
         total = sum(s.score for s in sections if s.score)
         average = total / sections.count()
         self.assertAlmostEqual(float(average), 17.20, places=2)
+
+
+class EvaluationSectionPrefetchTest(TestCase):
+    """Sections of listed evaluations are loaded in one query, not one per row."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Three evaluations with two sections each."""
+        for _ in range(3):
+            evaluation = Evaluation.objects.create(
+                student_id=uuid.uuid4(),
+                offer_id=uuid.uuid4()
+            )
+            EvaluationSection.objects.bulk_create([
+                EvaluationSection(evaluation=evaluation, criterion="Clinical Skills", score=Decimal("15.00")),
+                EvaluationSection(evaluation=evaluation, criterion="Communication", score=Decimal("17.00")),
+            ])
+    
+    def test_list_queryset_prefetches_sections(self):
+        """Test that list sections are served from the prefetch."""
+        view = EvaluationViewSet(action='list', request=Request(APIRequestFactory().get('/evaluations/')))
+        serializer = EvaluationWithDetailsSerializer()
+        
+        # One query for the evaluations, one for all of their sections
+        with self.assertNumQueries(2):
+            evaluations = list(view.get_queryset())
+        
+        with self.assertNumQueries(0):
+            sections = [serializer.get_sections(evaluation) for evaluation in evaluations]
+        
+        self.assertEqual(len(evaluations), 3)
+        self.assertTrue(all(len(evaluation_sections) == 2 for evaluation_sections in sections))
+
+
+class EvaluationReportStatsTest(TestCase):
+    """Test cases for the report summary aggregates."""
+    
+    def test_average_grade_ignores_zero_and_missing_grades(self):
+        """Test that zero and missing grades are left out of the average."""
+        student_id = uuid.uuid4()
+        Evaluation.objects.bulk_create([
+            Evaluation(student_id=student_id, offer_id=uuid.uuid4(), grade=grade, validated=validated)
+            for grade, validated in [
+                (Decimal("12.00"), True),
+                (Decimal("16.00"), False),
+                (Decimal("0.00"), False),
+                (None, False),
+            ]
+        ])
+        
+        stats = Evaluation.objects.filter(student_id=student_id).aggregate(**EVALUATION_STATS)
+        
+        self.assertEqual(stats['total'], 4)
+        self.assertEqual(stats['validated'], 1)
+        self.assertEqual(stats['average_grade'], Decimal("14.00"))
@@ -1,8 +1,11 @@
 """Views for evaluations app."""
+import logging
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
+from django.db import transaction
+from django.db.models import Prefetch
 from django.utils import timezone
 from .models import Evaluation, EvaluationSection
 from .serializers import (
@@ -18,6 +21,8 @@ from .serializers import (
 from utils.event_publisher import get_attendance_publisher
 from utils.rbac import get_user_role, get_user_id
 
+logger = logging.getLogger(__name__)
+
 
 def get_user_id_from_request(request):
     """Extract user ID from JWT token."""
@@ -33,15 +38,17 @@ def get_user_id_from_request(request):
             payload = jwt.decode(token, secret_key, algorithms=[algorithm])
             return payload.get('user_id') or payload.get('sub')
         except Exception as e:
-            print(f"Error decoding JWT: {e}")
+            logger.warning("Error decoding JWT: %s", e)
     return None
 
 
-class EvaluationPagination(PageNumberPagination):
-    """Pagination for evaluations."""
+class EvaluationPagination(CursorPagination):
+    """Keyset pagination for evaluations (constant cost at any depth, no COUNT)."""
     page_size = 20
     page_size_query_param = 'per_page'
     max_page_size = 100
+    # id breaks ties between evaluations submitted in the same instant
+    ordering = ('-submitted_at', '-id')
 
 
 class EvaluationViewSet(viewsets.ModelViewSet):
@@ -77,7 +84,13 @@ class EvaluationViewSet(viewsets.ModelViewSet):
         if validated is not None:
             queryset = queryset.filter(validated=validated.lower() == 'true')
         
-        return queryset.order_by('-submitted_at')
+        if self.action in ['list', 'retrieve']:
+            # One query for the sections of the whole page (see get_sections)
+            queryset = queryset.prefetch_related(
+                Prefetch('sections', queryset=EvaluationSection.objects.order_by('id'))
+            )
+        
+        return queryset.order_by(*EvaluationPagination.ordering)
     
     def create(self, request):
         """Create new evaluation with optional sections."""
@@ -86,24 +99,28 @@ class EvaluationViewSet(viewsets.ModelViewSet):
         
         user_id = get_user_id_from_request(request)
         
-        # Create evaluation
-        evaluation = Evaluation.objects.create(
-            student_id=serializer.validated_data['student_id'],
-            offer_id=serializer.validated_data['offer_id'],
-            evaluator_id=user_id or serializer.validated_data.get('evaluator_id'),
-            grade=serializer.validated_data.get('grade'),
-            comments=serializer.validated_data.get('comments'),
-        )
-        
-        # Create sections if provided
         sections_data = serializer.validated_data.get('sections', [])
-        for section_data in sections_data:
-            EvaluationSection.objects.create(
-                evaluation=evaluation,
-                criterion=section_data['criterion'],
-                score=section_data.get('score'),
-                comments=section_data.get('comments'),
+        
+        # Evaluation and its sections are written together: one INSERT each
+        with transaction.atomic():
+            evaluation = Evaluation.objects.create(
+                student_id=serializer.validated_data['student_id'],
+                offer_id=serializer.validated_data['offer_id'],
+                evaluator_id=user_id or serializer.validated_data.get('evaluator_id'),
+                grade=serializer.validated_data.get('grade'),
+                comments=serializer.validated_data.get('comments'),
             )
+            
+            if sections_data:
+                EvaluationSection.objects.bulk_create([
+                    EvaluationSection(
+                        evaluation=evaluation,
+                        criterion=section_data['criterion'],
+                        score=section_data.get('score'),
+                        comments=section_data.get('comments'),
+                    )
+                    for section_data in sections_data
+                ])
         
         # Publish evaluation.created event
         publisher = get_attendance_publisher()
@@ -131,34 +148,47 @@ class EvaluationViewSet(viewsets.ModelViewSet):
         if 'comments' in serializer.validated_data:
             evaluation.comments = serializer.validated_data['comments']
         
-        evaluation.save()
-        
-        # Update sections if provided
-        sections_data = serializer.validated_data.get('sections', [])
-        for section_data in sections_data:
-            section_id = section_data.get('id')
-            if section_id:
-                # Update existing section
-                try:
-                    section = EvaluationSection.objects.get(id=section_id, evaluation=evaluation)
+        with transaction.atomic():
+            evaluation.save()
+            
+            # Update sections if provided: existing ones are read with one IN
+            # query and written back with one bulk_update, new ones inserted in one batch
+            sections_data = serializer.validated_data.get('sections', [])
+            section_ids = [section_data['id'] for section_data in sections_data if section_data.get('id')]
+            existing = {
+                str(section.id): section
+                for section in EvaluationSection.objects.filter(id__in=section_ids, evaluation=evaluation)
+            } if section_ids else {}
+            changed_sections = {}
+            new_sections = []
+            for section_data in sections_data:
+                section_id = section_data.get('id')
+                if section_id:
+                    # Update existing section (unknown ids are ignored)
+                    section = existing.get(str(section_id))
+                    if section is None:
+                        continue
                     if 'criterion' in section_data:
                         section.criterion = section_data['criterion']
                     if 'score' in section_data:
                         section.score = section_data['score']
                     if 'comments' in section_data:
                         section.comments = section_data['comments']
-                    section.save()
-                except EvaluationSection.DoesNotExist:
-                    pass
-            else:
-                # Create new section
-                if 'criterion' in section_data:
-                    EvaluationSection.objects.create(
+                    changed_sections[section.id] = section
+                elif 'criterion' in section_data:
+                    new_sections.append(EvaluationSection(
                         evaluation=evaluation,
                         criterion=section_data['criterion'],
                         score=section_data.get('score'),
                         comments=section_data.get('comments'),
-                    )
+                    ))
+            
+            if changed_sections:
+                EvaluationSection.objects.bulk_update(
+                    list(changed_sections.values()), ['criterion', 'score', 'comments']
+                )
+            if new_sections:
+                EvaluationSection.objects.bulk_create(new_sections)
         
         # Publish event - if grade is set, it's a submission
         publisher = get_attendance_publisher()
@@ -0,0 +1,18 @@
+"""Query expressions shared by EVAL-SERVICE views and reports."""
+from django.db.models import IntegerField, Subquery
+
+
+class SubqueryCount(Subquery):
+    """
+    Number of rows returned by a (usually OuterRef-correlated) queryset.
+    
+    Use it instead of Count() across a reverse relation when annotating
+    several counts at once; each one runs as its own subquery, so the outer
+    query never JOINs and multiplies rows.
+    
+        Summary.objects.annotate(n=SubqueryCount(
+            Record.objects.filter(student_id=OuterRef('student_id')).values('id')
+        ))
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
@@ -1,12 +1,125 @@
 """Service client utilities for cross-service communication via Consul."""
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import orjson
 import requests
 import consul
 import logging
-from typing import Optional, Dict, Any
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Callable, Iterable
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# TTLs (seconds) for cached lookups; services, establishments and users
+# change far less often than student records and offers
+STUDENT_CACHE_TTL = 60
+OFFER_CACHE_TTL = 60
+REFERENCE_CACHE_TTL = 600
+
+# (connect, read) timeouts in seconds for cross-service calls; a peer that
+# cannot even accept a connection is given up on quickly
+REQUEST_TIMEOUT = (2, 5)
+
+# Discovered URLs are served from memory; once older than the soft TTL they
+# are refreshed in the background, past the hard TTL callers wait for Consul
+CONSUL_SOFT_TTL = 30
+CONSUL_HARD_TTL = 300
+
+# Per-service cap on Consul queries (tokens/second and burst); when the
+# bucket is empty the last known URL is reused, however old it is
+CONSUL_FETCH_RATE = float(os.environ.get('CONSUL_FETCH_RATE', '0.333'))
+CONSUL_FETCH_BURST = int(os.environ.get('CONSUL_FETCH_BURST', '3'))
+
+# A client stops calling its service for CIRCUIT_RESET_TIMEOUT seconds after
+# CIRCUIT_FAIL_MAX consecutive failures, instead of waiting out each timeout
+CIRCUIT_FAIL_MAX = 5
+CIRCUIT_RESET_TIMEOUT = 30
+
+# Shared pool for fanning out I/O-bound lookups (reused across requests).
+# Kept below the HTTPAdapter pool size so a fan-out never waits for a socket.
+SERVICE_CLIENT_MAX_WORKERS = int(os.environ.get('SERVICE_CLIENT_MAX_WORKERS', '16'))
+_executor = ThreadPoolExecutor(
+    max_workers=SERVICE_CLIENT_MAX_WORKERS,
+    thread_name_prefix='service-client'
+)
+
+
+def submit_many(fn: Callable[[str], Any], keys: Iterable) -> Dict[str, Future]:
+    """Start fn(key) on the shared pool for every distinct key (as str)."""
+    return {key: _executor.submit(fn, key) for key in {str(k) for k in keys}}
+
+
+def gather(futures: Dict[str, Future]) -> Dict[str, Any]:
+    """Wait for the futures from submit_many() and map each key to its result."""
+    return {key: future.result() for key, future in futures.items()}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens/second up to `burst`."""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> bool:
+        """Take one token if available, without blocking."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure circuit breaker.
+    
+    Once open, calls are refused until reset_timeout has elapsed; then a
+    single probe is let through, and its outcome closes or re-opens it.
+    """
+    
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Whether a call may be attempted now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at >= self.reset_timeout:
+                # Let this call probe; everyone else waits another period
+                self.opened_at = now
+                return True
+            return False
+    
+    def record_success(self):
+        """Close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        """Count a failure, opening the circuit once fail_max is reached."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                self.opened_at = time.monotonic()
+
 
 class ConsulServiceDiscovery:
     """Consul service discovery client with Docker DNS fallback."""
@@ -16,12 +129,98 @@ class ConsulServiceDiscovery:
         self.consul_port = int(os.environ.get('CONSUL_PORT', 8500))
         try:
             self.client = consul.Consul(host=self.consul_host, port=self.consul_port)
-            logger.info(f"✅ Consul client initialized at {self.consul_host}:{self.consul_port}")
+            logger.info("✅ Consul client initialized at %s:%s", self.consul_host, self.consul_port)
         except Exception as e:
-            logger.warning(f"⚠️ Failed to initialize Consul client: {e}")
+            logger.warning("⚠️ Failed to initialize Consul client: %s", e)
             self.client = None
+        # service_name -> (url, monotonic time it was discovered)
+        self._urls: Dict[str, tuple] = {}
+        self._refreshing = set()
+        # service_name -> Event set when the lookup in progress finishes
+        self._inflight: Dict[str, threading.Event] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
     
     def get_service_url(self, service_name: str) -> str:
+        """
+        Get service URL, serving a cached value while it is fresh enough.
+        
+        Stale entries (older than CONSUL_SOFT_TTL) are returned immediately
+        and refreshed on a background thread; entries past CONSUL_HARD_TTL
+        (or missing) are looked up synchronously. Refreshes of a known
+        service are rate-limited by a per-service token bucket.
+        """
+        with self._lock:
+            entry = self._urls.get(service_name)
+        if entry is not None:
+            url, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < CONSUL_SOFT_TTL:
+                return url
+            # Rate-limited: keep using the last known URL rather than pile on Consul
+            if not self._bucket(service_name).acquire():
+                return url
+            if age < CONSUL_HARD_TTL:
+                self._refresh_in_background(service_name)
+                return url
+        return self._refresh(service_name)
+    
+    def _bucket(self, service_name: str) -> TokenBucket:
+        """Get the Consul query budget for a service name."""
+        with self._lock:
+            bucket = self._buckets.get(service_name)
+            if bucket is None:
+                bucket = self._buckets[service_name] = TokenBucket(
+                    CONSUL_FETCH_RATE, CONSUL_FETCH_BURST
+                )
+            return bucket
+    
+    def _refresh(self, service_name: str) -> str:
+        """
+        Look the service up in Consul and remember the result.
+        
+        Concurrent callers for the same service share a single query: the
+        first one asks Consul, the others wait for its answer.
+        """
+        with self._lock:
+            event = self._inflight.get(service_name)
+            leader = event is None
+            if leader:
+                event = self._inflight[service_name] = threading.Event()
+        
+        if not leader:
+            event.wait(timeout=5)
+            with self._lock:
+                entry = self._urls.get(service_name)
+            return entry[0] if entry else self._discover(service_name)
+        
+        try:
+            url = self._discover(service_name)
+            with self._lock:
+                self._urls[service_name] = (url, time.monotonic())
+            return url
+        finally:
+            with self._lock:
+                self._inflight.pop(service_name, None)
+            event.set()
+    
+    def _refresh_in_background(self, service_name: str) -> None:
+        """Start one background refresh per service name at a time."""
+        with self._lock:
+            if service_name in self._refreshing:
+                return
+            self._refreshing.add(service_name)
+        
+        def run():
+            try:
+                self._refresh(service_name)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(service_name)
+        
+        threading.Thread(target=run, name=f'consul-refresh-{service_name}', daemon=True).start()
+    
+    def _discover(self, service_name: str) -> str:
         """
         Get service URL from Consul with Docker DNS fallback.
         
@@ -32,7 +231,7 @@ class ConsulServiceDiscovery:
             Service URL (e.g., 'http://auth-service:8000')
         """
         if not self.client:
-            logger.warning(f"⚠️ Consul client not available, using Docker DNS for {service_name}")
+            logger.warning("⚠️ Consul client not available, using Docker DNS for %s", service_name)
             return f"http://{service_name}:8000"
         
         try:
@@ -45,15 +244,15 @@ class ConsulServiceDiscovery:
                 # Docker's internal DNS will resolve to the correct IP dynamically
                 url = f"http://{service_name}:{port}"
                 
-                logger.info(f"✅ Discovered {service_name} via Consul, using Docker DNS: {url}")
+                logger.info("✅ Discovered %s via Consul, using Docker DNS: %s", service_name, url)
                 return url
             else:
-                logger.warning(f"⚠️ No healthy instances for {service_name} in Consul, using Docker DNS fallback")
+                logger.warning("⚠️ No healthy instances for %s in Consul, using Docker DNS fallback", service_name)
         except Exception as e:
-            logger.warning(f"⚠️ Consul discovery error for {service_name}: {e}")
+            logger.warning("⚠️ Consul discovery error for %s: %s", service_name, e)
         
         # Fallback to Docker DNS
-        logger.info(f"Using Docker DNS fallback for {service_name}")
+        logger.info("Using Docker DNS fallback for %s", service_name)
         return f"http://{service_name}:8000"
 
 
@@ -67,11 +266,46 @@ class ServiceClient:
     def __init__(self, service_name: str):
         self.service_name = service_name
         self.base_url = None
+        # Keep-alive connection pool so repeated calls reuse the same sockets.
+        # Only gateway 5xx answers are retried: a connect error or read
+        # timeout fails straight away so the breaker sees every outage
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=max(50, SERVICE_CLIENT_MAX_WORKERS),
+            max_retries=Retry(
+                total=2, connect=0, read=0, status=2,
+                backoff_factor=0.1, status_forcelist=[502, 503, 504],
+            )
+        ))
+        self.session.headers['Accept'] = 'application/json'
+        self.breaker = CircuitBreaker(CIRCUIT_FAIL_MAX, CIRCUIT_RESET_TIMEOUT)
+        # Per-resource TTL caches filled by subclasses; TTLCache is not
+        # thread-safe, hence the lock
+        self._lock = threading.RLock()
+        self._caches: Dict[str, TTLCache] = {}
+    
+    def _cached_get(self, resource: str, obj_id, endpoint: str) -> Optional[Dict[str, Any]]:
+        """GET endpoint, reusing a recent successful response for (resource, obj_id)."""
+        key = str(obj_id)
+        cache = self._caches[resource]
+        with self._lock:
+            data = cache.get(key)
+        if data is None:
+            data = self._make_request('GET', endpoint)
+            if data is not None:
+                with self._lock:
+                    cache[key] = data
+        return data
+    
+    def invalidate(self, resource: str, obj_id) -> None:
+        """Drop a cached record, e.g. after an update event."""
+        with self._lock:
+            self._caches[resource].pop(str(obj_id), None)
     
     def _get_base_url(self) -> str:
-        """Get or refresh base URL from Consul."""
-        if not self.base_url:
-            self.base_url = _consul.get_service_url(self.service_name)
+        """Get base URL from Consul (cached and kept fresh by the discovery client)."""
+        self.base_url = _consul.get_service_url(self.service_name)
         return self.base_url
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict[str, Any]]:
@@ -84,18 +318,31 @@ class ServiceClient:
             **kwargs: Additional request parameters
             
         Returns:
-            Response JSON data or None if request fails
+            Response JSON data or None if request fails (or the circuit is open)
         """
+        if not self.breaker.allow():
+            logger.debug("Circuit open for %s, skipping %s %s", self.service_name, method, endpoint)
+            return None
+        
         base_url = self._get_base_url()
         url = f"{base_url}{endpoint}"
         
         try:
-            response = requests.request(method, url, timeout=5, **kwargs)
+            response = self.session.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Failed to call {self.service_name} at {url}: {e}")
+            # Decode the (already gunzipped) bytes directly, no str round trip
+            data = orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            # A 4xx means the service is up and answering; only outages count
+            error_response = getattr(e, 'response', None)
+            if error_response is not None and error_response.status_code < 500:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            logger.error("❌ Failed to call %s at %s: %s", self.service_name, url, e)
             return None
+        self.breaker.record_success()
+        return data
 
 
 class AuthServiceClient(ServiceClient):
@@ -103,10 +350,11 @@ class AuthServiceClient(ServiceClient):
     
     def __init__(self):
         super().__init__(os.environ.get('AUTH_SERVICE_NAME', 'auth-service'))
+        self._caches['users'] = TTLCache(maxsize=1000, ttl=REFERENCE_CACHE_TTL)
     
     def get_user_details(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user (encadrant) details by ID."""
-        return self._make_request('GET', f"/auth/api/v1/users/{user_id}")
+        return self._cached_get('users', user_id, f"/auth/api/v1/users/{user_id}")
 
 
 class ProfileServiceClient(ServiceClient):
@@ -114,18 +362,32 @@ class ProfileServiceClient(ServiceClient):
     
     def __init__(self):
         super().__init__(os.environ.get('PROFILE_SERVICE_NAME', 'profile-service'))
+        self._caches.update({
+            'students': TTLCache(maxsize=10000, ttl=STUDENT_CACHE_TTL),
+            'services': TTLCache(maxsize=1000, ttl=REFERENCE_CACHE_TTL),
+            'establishments': TTLCache(maxsize=1000, ttl=REFERENCE_CACHE_TTL),
+        })
     
     def get_service_details(self, service_id: str) -> Optional[Dict[str, Any]]:
         """Get service details by ID."""
-        return self._make_request('GET', f"/profile/api/services/{service_id}/")
+        return self._cached_get('services', service_id, f"/profile/api/services/{service_id}/")
     
     def get_establishment_details(self, establishment_id: str) -> Optional[Dict[str, Any]]:
         """Get establishment details by ID."""
-        return self._make_request('GET', f"/profile/api/establishments/{establishment_id}/")
+        return self._cached_get('establishments', establishment_id, f"/profile/api/establishments/{establishment_id}/")
     
     def get_student_details(self, student_id: str) -> Optional[Dict[str, Any]]:
         """Get student details by ID."""
-        return self._make_request('GET', f"/profile/api/students/{student_id}/")
+        return self._cached_get('students', student_id, f"/profile/api/students/{student_id}/")
+    
+    def get_students_details(self, student_ids: Iterable) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get details for many students at once, keyed by str(student_id).
+        
+        PROFILE-SERVICE has no bulk endpoint, so the individual lookups are
+        issued concurrently on the shared pool instead of one after another.
+        """
+        return gather(submit_many(self.get_student_details, student_ids))
 
 
 class CoreServiceClient(ServiceClient):
@@ -133,23 +395,31 @@ class CoreServiceClient(ServiceClient):
     
     def __init__(self):
         super().__init__(os.environ.get('CORE_SERVICE_NAME', 'core-service'))
+        self._caches['offers'] = TTLCache(maxsize=5000, ttl=OFFER_CACHE_TTL)
     
     def get_offer_details(self, offer_id: str) -> Optional[Dict[str, Any]]:
         """Get offer details by ID."""
-        return self._make_request('GET', f"/core/offers/{offer_id}")
+        return self._cached_get('offers', offer_id, f"/core/offers/{offer_id}")
+    
+    def get_offers_details(self, offer_ids: Iterable) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get details for many offers concurrently, keyed by str(offer_id)."""
+        return gather(submit_many(self.get_offer_details, offer_ids))
 
 
 # Singleton instances
 _auth_client = None
 _profile_client = None
 _core_client = None
+_clients_lock = threading.Lock()
 
 
 def get_auth_client() -> AuthServiceClient:
     """Get singleton AuthServiceClient."""
     global _auth_client
     if _auth_client is None:
-        _auth_client = AuthServiceClient()
+        with _clients_lock:
+            if _auth_client is None:
+                _auth_client = AuthServiceClient()
     return _auth_client
 
 
@@ -157,7 +427,9 @@ def get_profile_client() -> ProfileServiceClient:
     """Get singleton ProfileServiceClient."""
     global _profile_client
     if _profile_client is None:
-        _profile_client = ProfileServiceClient()
+        with _clients_lock:
+            if _profile_client is None:
+                _profile_client = ProfileServiceClient()
     return _profile_client
 
 
@@ -165,5 +437,7 @@ def get_core_client() -> CoreServiceClient:
     """Get singleton CoreServiceClient."""
     global _core_client
     if _core_client is None:
-        _core_client = CoreServiceClient()
+        with _clients_lock:
+            if _core_client is None:
+                _core_client = CoreServiceClient()
     return _core_client
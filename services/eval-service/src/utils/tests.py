@@ -0,0 +1,28 @@
+"""
+Unit tests for eval-service utils.
+Tests the retry policy of the cross-service HTTP clients.
+"""
+from unittest import mock
+from django.test import SimpleTestCase
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import ReadTimeoutError
+from utils.service_client import ServiceClient
+
+
+class ServiceClientRetryTest(SimpleTestCase):
+    """Test cases for ServiceClient retries."""
+
+    def test_read_timeout_is_not_retried(self):
+        """A hanging peer costs one attempt per call, not three."""
+        client = ServiceClient('core-service')
+
+        def timeout(pool, *args, **kwargs):
+            raise ReadTimeoutError(pool, None, 'Read timed out.')
+
+        with mock.patch.object(ServiceClient, '_get_base_url', return_value='http://core-service:8000'), \
+                mock.patch.object(HTTPConnectionPool, '_make_request', autospec=True, side_effect=timeout) as make:
+            self.assertIsNone(client._make_request('GET', '/api/offers/1/'))
+            self.assertEqual(make.call_count, 1)
+            self.assertIsNone(client._make_request('GET', '/api/offers/1/'))
+            self.assertEqual(make.call_count, 2)
+        self.assertEqual(client.breaker.failures, 2)